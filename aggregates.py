@@ -0,0 +1,117 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from matrix import PortfolioMatrix, get_matrix
+
+
+class RankedCounts:
+    """Integer counts kept in sorted order under +1/-1 updates in O(1).
+
+    ``order`` lists item positions by ascending count, ``rank`` is its inverse
+    and ``first[c]`` is the index in ``order`` where the block of items with
+    count ``c`` starts (the number of items with a smaller count). Changing an
+    item's count by one swaps it to the edge of its block and moves one
+    boundary, so the ordering never needs a re-sort.
+    """
+
+    def __init__(self, counts, max_count):
+        self.counts = np.asarray(counts, dtype=np.int64).copy()
+        # Ties are laid out in reverse so descending() starts in catalogue order
+        n = len(self.counts)
+        self.order = n - 1 - np.argsort(self.counts[::-1], kind="stable")
+        self.rank = np.empty_like(self.order)
+        self.rank[self.order] = np.arange(len(self.order))
+        self.first = np.searchsorted(self.counts[self.order], np.arange(max_count + 2), side="left")
+
+    def _swap(self, i, j):
+        a, b = self.order[i], self.order[j]
+        self.order[i], self.order[j] = b, a
+        self.rank[a], self.rank[b] = j, i
+
+    def increment(self, item):
+        c = self.counts[item]
+        # Move to the end of the block of count c, which then becomes the start of block c + 1
+        self._swap(self.rank[item], self.first[c + 1] - 1)
+        self.first[c + 1] -= 1
+        self.counts[item] = c + 1
+
+    def decrement(self, item):
+        c = self.counts[item]
+        # Move to the start of the block of count c, which then becomes the end of block c - 1
+        self._swap(self.rank[item], self.first[c])
+        self.first[c] += 1
+        self.counts[item] = c - 1
+
+    def descending(self):
+        """Item positions from the highest count to the lowest (a view, not a copy)."""
+        return self.order[::-1]
+
+
+class CoverageAggregates:
+    """Coverage statistics of the portfolio matrix, kept current under cell edits.
+
+    Holds per-solution coverage, per-industry solution counts, their total and
+    both rank orderings. Built once per data version and subscribed to the
+    matrix, whose edits reach set_cell() and update every figure in O(1).
+    """
+
+    def __init__(self, matrix):
+        self.cache_key = matrix.cache_key
+        self.n_solutions, self.n_industries = matrix.shape
+        self.industry_names = np.asarray(matrix.industries, dtype=object)
+        self.industry_index = matrix.industry_index
+        self.solutions = RankedCounts(matrix.values.sum(axis=1), self.n_industries)
+        self.industries = RankedCounts(matrix.values.sum(axis=0), self.n_solutions)
+        self.total = int(self.solutions.counts.sum())
+        self._lock = threading.Lock()
+
+    @property
+    def solution_coverage(self):
+        return self.solutions.counts
+
+    @property
+    def industry_counts(self):
+        return self.industries.counts
+
+    @property
+    def mean_solutions_per_industry(self):
+        return self.total / self.n_industries if self.n_industries else 0.0
+
+    def industry_count(self, industry):
+        return int(self.industries.counts[self.industry_index[industry]])
+
+    def set_cell(self, solution_pos, industry_pos, value):
+        """Record that one matrix cell has just changed to ``value``."""
+        with self._lock:
+            if value:
+                self.solutions.increment(solution_pos)
+                self.industries.increment(industry_pos)
+                self.total += 1
+            else:
+                self.solutions.decrement(solution_pos)
+                self.industries.decrement(industry_pos)
+                self.total -= 1
+
+    def industry_comparison(self):
+        """Every industry with its solution count, most-served first."""
+        order = self.industries.descending()
+        return pd.DataFrame({
+            "Industry": self.industry_names[order],
+            "Solution Count": self.industries.counts[order],
+        })
+
+
+@st.cache_resource(show_spinner=False, max_entries=4, hash_funcs={PortfolioMatrix: lambda m: m.cache_key})
+def _build_aggregates(matrix):
+    with matrix.edit_lock:
+        aggregates = CoverageAggregates(matrix)
+        matrix.subscribe(aggregates.set_cell)
+    return aggregates
+
+
+def get_aggregates(matrix=None):
+    """The aggregates store for the current data version."""
+    return _build_aggregates(matrix if matrix is not None else get_matrix())
@@ -1,149 +1,474 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from streamlit_extras.colored_header import colored_header
-from streamlit_extras.metric_cards import style_metric_cards
-import streamlit_nested_layout
-import time
 
-# Sample Data (replace with actual data from your table)
-data = {
-    "AI Solution": [
-        "IoT", "Blockchain powered AI systems", "Hyperpersonalisation", "Recommendation engine", "Chatbot",
-        "Social media manager", "AI adverts", "Ticket handling", "Review summariser", "Smart data cleaning",
-        "AI powered SEO engine", "AI agent copy writer", "Analytics dashboard", "Custom AI/ML solutions",
-        "Business analytics and optimisation"
-    ],
-    "Ecommerce": ["✔", "", "✔", "✔", "✔", "✔", "✔", "", "✔", "", "✔", "", "", "", "✔"],
-    "Gcloud": ["", "✔", "", "✔", "✔", "", "", "", "", "", "", "", "", "✔", ""],
-    "HR Tech Solutions": ["", "", "", "", "", "", "", "", "", "", "", "", "", "✔", ""],
-    "Managed IT Services": ["", "", "", "", "", "", "", "", "", "", "", "", "", "✔", ""],
-    "Modern Tech Support": ["✔", "", "", "", "", "", "", "✔", "", "", "", "", "", "✔", ""],
-    "Govt Solutions": ["", "", "", "", "", "", "", "✔", "", "", "", "", "", "✔", ""],
-    "Telecommunications": ["", "", "", "", "", "", "", "✔", "", "", "", "", "", "✔", ""],
-    "Data Productization": ["", "", "", "", "", "", "", "", "", "", "", "", "✔", "", ""],
-    "SAP": ["", "", "", "", "", "", "", "", "", "", "", "", "", "", ""],
-    "Salesforce": ["", "", "", "", "", "", "", "", "", "", "", "", "", "", ""],
-    "Adobe": ["", "", "", "", "", "", "", "", "", "", "", "", "", "", ""],
-    "Blockchain": ["", "✔", "", "", "", "", "", "", "", "", "", "", "", "✔", "✔"]
-}
+import assets
+import data_source
+import edits
+import perf
+from aggregates import get_aggregates
+from bitset_index import get_index
+from charts import distribution_figure, solution_availability_figure
+from crosswalk import get_crosswalk
+from derived import get_derived_state
+from figure_cache import get_figure_cache
+from matrix import get_matrix
+from matrix_table import (
+    TABLE_MAX_COLUMNS, TABLE_PAGE_SIZES, TABLE_SORT_OPTIONS, get_services_table, table_rows, table_window
+)
+from prerender import get_bundle, solution_availability_key, solutions_matrix_key, table_key
+from search_index import get_industry_search, get_solution_search
+from similarity import get_similarity_engine
 
-df = pd.DataFrame(data)
+# Custom CSS, served from static/dashboard.css under its content hash
+def apply_custom_css():
+    st.markdown(assets.stylesheet("dashboard.css"), unsafe_allow_html=True)
 
-import streamlit as st
-import pandas as pd
+def colored_header(label, description, color="#1c83e1"):
+    # Same markup as streamlit_extras' colored_header ("blue-70"), without its import cost
+    st.subheader(label)
+    st.write(
+        f'<hr style="background-color: {color}; margin-top: 0;'
+        ' margin-bottom: 0; height: 3px; border: none; border-radius: 3px;">',
+        unsafe_allow_html=True,
+    )
+    st.caption(description)
 
-# Sample Data (Modify as needed)
-data_2 = {
-    "Industry": [
-        "Hyperpersonalisation", "Recommendation Engine", "Chatbot", "Social Media Manager",
-        "AI Adverts", "Ticket Handling", "Customer Reviews Summariser", "AI Powered SEO Engine",
-        "AI Agent Copy Writer", "Analytics Dashboard", "Custom AI/ML Solutions",
-        "Business Analytics and Optimisation", "Business VoIP", "Live Chat",
-        "Multi Channel Service", "Reviews Management"
-    ],
-    "Content Marketing": ["✅", "", "", "✅", "✅", "", "", "", "✅", "", "✅", "", "", "", "", ""],
-    "Digital Advertising": ["✅", "✅", "✅", "✅", "✅", "", "", "", "✅", "", "✅", "✅", "", "", "", "✅"],
-    "Ecommerce": ["✅", "✅", "✅", "✅", "✅", "✅", "✅", "", "✅", "✅", "✅", "✅", "✅", "", "✅", "✅"],
-    "SEO Services": ["✅", "", "", "", "", "", "", "✅", "", "", "", "", "", "", "", ""],
-    "Shopify Ecommerce": ["✅", "✅", "✅", "", "", "✅", "✅", "", "", "✅", "", "✅", "✅", "", "✅", "✅"],
-    "Social Media": ["✅", "", "✅", "✅", "✅", "✅", "", "✅", "✅", "", "", "", "", "✅", "✅", "✅"],
-    "UX Website Design": ["", "", "✅", "", "", "", "", "✅", "", "", "✅", "✅", "", "", "", ""],
-    "Website Assessment": ["", "", "", "", "", "", "", "✅", "", "✅", "✅", "✅", "", "", "", "✅"]
-}
+def create_card(title, content):
+    st.markdown(f"""
+    <div class="card">
+        <div class="card-title">{title}</div>
+        {content}
+    </div>
+    """, unsafe_allow_html=True)
 
+SOLUTION_CATEGORIES = [
+    "All Solutions",
+    "Popular Solutions (3+ industries)",
+    "Specialized Solutions (1-2 industries)"
+]
+CHART_TYPES = ["Bar Chart", "Grouped Bar", "Radar Chart"]
+COLOR_THEMES = ["Blues", "Viridis", "Plasma", "Reds", "Greens"]
+SIMILARITY_METRICS = {"jaccard": "Jaccard", "cosine": "Cosine"}
+SIMILAR_SOLUTIONS = 10
+# Options sent to the browser by the searchable pickers
+PICKER_OPTIONS = 50
 
-# Convert to DataFrame
-df_2 = pd.DataFrame(data_2)
-df_2 = df_2.reset_index(drop=True)
+# Each section below is an st.fragment: a widget change inside it reruns only
+# that function, with the inputs it was last called with from main().
 
+@st.fragment
+@perf.timed("sidebar_filters")
+def render_sidebar_filters(industries):
+    with st.expander("🔍 FILTER OPTIONS", expanded=True):
+        selected_industries = st.multiselect("Select Industries", industries, default=industries, key="selected_industries")
+        solution_category = st.radio("Solution Category", SOLUTION_CATEGORIES, key="solution_category")
+    
+    with st.expander("📊 VISUALIZATION OPTIONS", expanded=False):
+        chart_type = st.selectbox(
+            "Select Chart Type",
+            CHART_TYPES,
+            key="chart_type"
+        )
+        
+        color_theme = st.selectbox(
+            "Color Theme",
+            COLOR_THEMES,
+            key="color_theme"
+        )
+        
+        show_percentages = st.checkbox("Show Percentages", value=False, key="show_percentages")
+    
+    # show_percentages is not read by any section, so toggling it only reruns this fragment
+    filters = {
+        "selected_industries": selected_industries,
+        "solution_category": solution_category,
+        "chart_type": chart_type,
+        "color_theme": color_theme,
+    }
+    # The tabs are rendered from these values, so once they differ from what the
+    # page was last rendered with, rerun the whole app rather than just this fragment
+    if st.session_state.get("rendered_filters", filters) != filters:
+        st.session_state["rendered_filters"] = filters
+        st.rerun()
+    st.session_state["rendered_filters"] = filters
+    return filters
 
+def filter_solutions(index, solution_category):
+    """Row positions of the solutions in the chosen category, or None for all of them."""
+    if solution_category == "Popular Solutions (3+ industries)":
+        return index.positions(index.coverage_at_least(3))
+    if solution_category == "Specialized Solutions (1-2 industries)":
+        return index.positions(index.negate(index.coverage_at_least(3)))
+    return None
 
-def set_light_theme(fig):
-    fig.update_layout(
-        template="plotly_white",
-        paper_bgcolor="white",
-        plot_bgcolor="white",
-        font=dict(color="black"),  # Set all text to black
-        margin=dict(l=40, r=40, t=50, b=40),
-        xaxis=dict(
-            showgrid=True,  
-            gridcolor="lightgray",  # Light gray grid for visibility
-            tickfont=dict(color="black"),  # X-axis labels in black
-            title=dict(text="Our offerings", font=dict(color="black"))  # X-axis title in black
-        ),
-        yaxis=dict(
-            showgrid=True,
-            gridcolor="lightgray",
-            tickfont=dict(color="black"),  # Y-axis labels in black
-            title=dict(text="Number of possible ventures", font=dict(color="black"))  # Y-axis title in black
-        ),
-    )
-    return fig
+def search_select(label, search, allowed, key, search_label, placeholder):
+    # Matching runs server-side against the shared index, so only the best
+    # PICKER_OPTIONS names are sent as options instead of the whole catalogue
+    query = st.text_input(search_label, key=f"{key}_search", placeholder=placeholder)
+    with perf.span(f"{key}.search"):
+        matches = [search.names[i] for i in search.search(query, PICKER_OPTIONS, allowed)]
+    # Keep the current choice among the options while it is allowed, so a query
+    # that excludes it never resets the selection
+    found = bool(matches)
+    current = st.session_state.get(key)
+    if current in search.positions and current not in matches and (allowed is None or allowed[search.positions[current]]):
+        matches.append(current)
+    if not found:
+        st.info("No matches for this search.")
+    if not matches:
+        return None
+    # New options make a new widget, which would otherwise start from the first option
+    index = matches.index(current) if current in matches else 0
+    return st.selectbox(label, matches, index=index, key=key)
 
-# Function to convert '✔' to 1 and '' to 0
-def transform_data_for_analysis(dataframe):
-    df_copy = dataframe.copy()
-    for col in df_copy.columns:
-        if col != 'AI Solution':
-            df_copy[col] = df_copy[col].apply(lambda x: 1 if x == '✔' else 0)
-    return df_copy
+def reset_table_page():
+    st.session_state["table_page"] = 1
 
-# Custom CSS
-def apply_custom_css():
-    st.markdown("""
-<style>
-    /* Ensure dropdown background is white and text is black */
-    div[data-baseweb="select"], 
-    div[data-baseweb="popover"], 
-    div[data-baseweb="menu"], 
-    div[role="listbox"] {
-        background-color: #FFFFFF !important; /* ✅ White background */
-        color: #000000 !important; /* ✅ Black text */
-        border: 1px solid #E2E8F0 !important;
-    }
+def save_matrix_edits(matrix, editor_key, solutions, industries):
+    # edited_rows maps a row position in the edited window to {column: new value}
+    edited_rows = st.session_state[editor_key]["edited_rows"]
+    changes = [
+        (solutions[int(row)], industry, value)
+        for row, cells in edited_rows.items() for industry, value in cells.items()
+        if industry in industries
+    ]
+    if edits.record_edits(matrix, changes):
+        st.session_state["matrix_edited"] = True
 
-    /* ✅ Dropdown Options */
-    div[role="option"] {
-        background-color: #FFFFFF !important; /* ✅ White */
-        color: #000000 !important; /* ✅ Black */
-    }
-    div[role="option"]:hover {
-        background-color: #E2E8F0 !important; /* ✅ Light Gray Hover */
-        color: #000000 !important;
-    }
-
-    /* ✅ Fix selected dropdown option */
-    div[data-baseweb="select"] div[role="option"][aria-selected="true"] {
-        background-color: #E2E8F0 !important; /* ✅ Light Gray */
-        color: #000000 !important;
-    }
-
-    /* ✅ Fix text input inside dropdown */
-    div[data-baseweb="select"] input {
-        background-color: #FFFFFF !important;
-        color: #000000 !important;
+@st.fragment
+@perf.timed("solutions_matrix.table")
+def render_matrix_table(matrix, index, solution_rows, solution_category, selected_industries):
+    # Every tab reads the edited matrix, so rerun the whole app after an edit
+    if st.session_state.pop("matrix_edited", False):
+        st.rerun()
+    
+    # Search, sort and paging all run here against the cached matrix; only the
+    # visible window of rows and industry columns is sent to the browser
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        query = st.text_input("Search solutions", key="table_search", placeholder="Type to filter by name", on_change=reset_table_page)
+    with col2:
+        sort_by = st.selectbox("Sort by", TABLE_SORT_OPTIONS, key="table_sort", on_change=reset_table_page)
+    with col3:
+        page_size = st.selectbox("Rows per page", TABLE_PAGE_SIZES, key="table_page_size", on_change=reset_table_page)
+    
+    rows = table_rows(matrix, index, solution_rows, selected_industries, query, sort_by)
+    n_pages = max(1, -(-len(rows) // page_size))
+    n_column_windows = max(1, -(-len(selected_industries) // TABLE_MAX_COLUMNS))
+    
+    # Keep the stored page in range when a search or filter shrinks the result
+    st.session_state["table_page"] = min(st.session_state.get("table_page", 1), n_pages)
+    st.session_state["table_columns"] = min(st.session_state.get("table_columns", 1), n_column_windows)
+    page, column_window = 1, 1
+    if n_pages > 1 or n_column_windows > 1:
+        col1, col2 = st.columns(2)
+        with col1:
+            page = st.number_input("Page", min_value=1, max_value=n_pages, key="table_page")
+        with col2:
+            column_window = st.number_input(
+                f"Industry columns (groups of {TABLE_MAX_COLUMNS})",
+                min_value=1, max_value=n_column_windows, key="table_columns"
+            )
+    
+    start = (page - 1) * page_size
+    first_column = (column_window - 1) * TABLE_MAX_COLUMNS
+    window = None
+    if not query and sort_by == TABLE_SORT_OPTIONS[0] and start == 0 and first_column == 0:
+        # The first page of the default view may have been pre-rendered for this data version
+        bundle = get_bundle(matrix.version)
+        key = table_key(matrix.version, solution_category, selected_industries, page_size)
+        if bundle is not None and key in bundle.tables:
+            window = get_figure_cache().get_or_build(key, lambda: bundle.table(key))
+    if window is None:
+        window = table_window(matrix, rows, selected_industries, start, page_size, first_column)
+    editing = st.toggle("Edit mode", key="edit_matrix", help="Tick or untick cells to change which solutions apply to which industry")
+    column_config = {
+        col: st.column_config.CheckboxColumn(
+            col,
+            help=f"AI solutions available for {col}",
+            width="medium",
+            disabled=not editing
+        ) for col in window.columns
     }
+    with perf.span("solutions_matrix.dataframe"):
+        if editing:
+            # Keyed on the version and window so pending edits never carry over to other cells
+            editor_key = f"matrix_editor_{matrix.version}_{start}_{first_column}"
+            st.data_editor(
+                window,
+                use_container_width=True,
+                height=400,
+                hide_index=False,
+                column_config=column_config,
+                disabled=[window.index.name],
+                key=editor_key,
+                on_change=save_matrix_edits,
+                args=(matrix, editor_key, window.index.tolist(), set(window.columns))
+            )
+        else:
+            st.dataframe(
+                window,
+                use_container_width=True,
+                height=400,
+                hide_index=False,
+                column_config=column_config
+            )
+    st.caption(
+        f"Showing solutions {min(start + 1, len(rows))}-{start + len(window)} of {len(rows)}"
+        f" · industries {first_column + 1}-{first_column + len(window.columns)} of {len(selected_industries)}"
+    )
 
-    /* ✅ Fix Scroll & Overflow */
-    div[role="listbox"] {
-        max-height: 300px !important;
-        overflow-y: auto !important;
-    }
-</style>
+@st.fragment
+@perf.timed("solutions_matrix")
+def render_solutions_matrix(matrix, index, aggregates, solution_rows, solution_category, selected_industries, chart_type, color_theme):
+    st.markdown("### AI Solutions by Industry")
+    st.markdown("This matrix shows which AI solutions can be implemented across different industries")
+                
+    render_matrix_table(matrix, index, solution_rows, solution_category, selected_industries)
+    
+    # Create heatmap visualization
+    if len(selected_industries) > 0:
+        st.markdown("### Solutions Distribution Visualization")
+        
+        # Built once per view and data version, then shared by every session;
+        # taken from the pre-rendered bundle when it covers this view
+        key = solutions_matrix_key(matrix.version, chart_type, color_theme, solution_category, selected_industries)
+        bundle = get_bundle(matrix.version)
+        with perf.span("solutions_matrix.figure"):
+            fig = get_figure_cache().get_or_build(
+                key, lambda: (bundle and bundle.figure(key)) or distribution_figure(
+                    matrix, index, aggregates, solution_rows, selected_industries, chart_type, color_theme
+                )
+            )
+        if fig is not None:
+            with perf.span("solutions_matrix.plotly_chart"):
+                st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.info("No data available for visualization with current filters.")
 
+@st.fragment
+@perf.timed("deep_dive")
+def render_deep_dive(matrix, solution_options, solution_mask, selected_industries):
+    # Solution deep-dive section with better UX and visuals
+    st.markdown("### AI Solution Spotlight")
+    st.markdown("Explore individual AI solutions and their industry applications")
+    
+    if len(solution_options) == 0 or not selected_industries:
+        st.info("No solutions match the current filters.")
+        return
+    
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        selected_solution = search_select(
+            "Select AI Solution",
+            get_solution_search(matrix),
+            solution_mask,
+            key="solution_select",
+            search_label="Search AI Solutions",
+            placeholder="Type a name or a keyword"
+        )
+        if selected_solution is None:
+            return
+        
+        # Only recomputed when the solution, the industry selection or the data changes
+        available = get_derived_state().value(
+            "solution_availability",
+            (matrix.version, selected_solution, selected_industries),
+            lambda: matrix.row(selected_solution, selected_industries)
+        )
+        n_covered = int(available.sum())
+        
+        st.markdown(f"### {selected_solution}")
+        st.markdown(f"**Industries covered:** {n_covered}/{len(selected_industries)}")
+        
+        # Coverage percentage
+        coverage = n_covered / len(selected_industries) * 100
+        st.progress(coverage/100)
+        st.caption(f"{coverage:.1f}% industry coverage")
+        
+        # Add some descriptive text based on the solution
+        
+        if selected_solution in data_source.SOLUTION_DESCRIPTIONS:
+            st.info(data_source.SOLUTION_DESCRIPTIONS[selected_solution])
+        
+    with col2:
+        # Show industries where this solution is used
+        st.write("### Industry Applications")
+        
+        key = solution_availability_key(matrix.version, selected_solution, selected_industries)
+        bundle = get_bundle(matrix.version)
+        with perf.span("deep_dive.figure"):
+            fig = get_figure_cache().get_or_build(
+                key, lambda: (bundle and bundle.figure(key)) or solution_availability_figure(
+                    selected_solution, selected_industries, available
+                )
+            )
 
+        with perf.span("deep_dive.plotly_chart"):
+            st.plotly_chart(fig, use_container_width=True)
+        
+        # Implementation examples or details
+        st.markdown("#### Implementation Highlights")
+        
+        implementation_examples = {
+            "Chatbot": [
+                "Customer service automation reducing response time by 75%",
+                "Sales qualification increasing conversion rates by 15%",
+                "24/7 technical support coverage with 92% resolution rate"
+            ],
+            "IoT": [
+                "Predictive maintenance reducing downtime by 35%",
+                "Supply chain visibility improving delivery accuracy by 22%",
+                "Smart inventory management reducing holding costs by 18%"
+            ]
+        }
+        
+        # if selected_solution in implementation_examples:
+        #     for example in implementation_examples[selected_solution]:
+        #         st.markdown(f"✅ {example}")
+        # else:
+        st.markdown("✅ Custom implementation available based on industry requirements")
+        st.markdown("✅ Integration with existing systems and workflows")
+        st.markdown("✅ Continuous improvement through machine learning")
 
-    """, unsafe_allow_html=True)
+    st.markdown("#### Solutions with a similar industry footprint")
+    metric = st.radio(
+        "Similarity",
+        list(SIMILARITY_METRICS),
+        format_func=SIMILARITY_METRICS.get,
+        horizontal=True,
+        key="similarity_metric"
+    )
+    # Footprints are compared over the selected industries; cached per solution and data version
+    with perf.span("deep_dive.similar"):
+        similar = get_similarity_engine(matrix).neighbours(
+            matrix.solution_index[selected_solution], SIMILAR_SOLUTIONS, metric, selected_industries
+        )
+    if len(similar.positions) == 0:
+        st.caption("No other solution shares an industry with this one.")
+        return
+    st.dataframe(
+        pd.DataFrame({
+            "AI Solution": matrix.solutions[similar.positions],
+            "Similarity": similar.scores,
+            "Shared industries": similar.shared,
+        }),
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "Similarity": st.column_config.ProgressColumn("Similarity", format="%.2f", min_value=0.0, max_value=1.0),
+        }
+    )
 
-def create_card(title, content):
-    st.markdown(f"""
-    <div class="card">
-        <div class="card-title">{title}</div>
-        {content}
-    </div>
-    """, unsafe_allow_html=True)
+@st.fragment
+@perf.timed("industry_analysis")
+def render_industry_analysis(matrix, index, aggregates, selected_industries):
+    # Industry focus
+    st.markdown("### Industry AI Solution Profile")
+    st.markdown("Analyze AI solution coverage by industry vertical")
+    
+    if not selected_industries:
+        st.info("Select at least one industry to analyze.")
+        return
+    
+    industry_search = get_industry_search(matrix)
+    industry_mask = get_derived_state().value(
+        "industry_search_mask", (matrix.version, selected_industries),
+        lambda: industry_search.mask(selected_industries)
+    )
+    selected_industry = search_select(
+        "Select Industry to Analyze",
+        industry_search,
+        industry_mask,
+        key="industry_select",
+        search_label="Search Industries",
+        placeholder="Type an industry name"
+    )
+    if selected_industry is None:
+        return
+    
+    # Create industry profile
+    derived = get_derived_state()
+    industry_inputs = (matrix.version, selected_industry)
+    available_solutions = derived.value(
+        "available_solutions", industry_inputs,
+        lambda: matrix.solutions[index.solutions_for(selected_industry)].tolist()
+    )
+    
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        industry_counts = aggregates.industry_count(selected_industry)
+        st.markdown(f"### {selected_industry}")
+        st.markdown(f"**Solutions available:** {industry_counts}")
+        
+        # Coverage percentage
+        industry_coverage = industry_counts / aggregates.n_solutions * 100
+        # st.progress(industry_coverage/100)
+        # st.caption(f"{industry_coverage:.1f}% solution coverage")
+        
+        # Show the list of available solutions for this industry
+        st.markdown("#### Available AI Solutions")
+        
+        for solution in available_solutions:
+            st.markdown(f"✅ {solution}")
+            
+    with col2:
+        # Visualization for industry breakdown
+        # Counts and their ordering are maintained by the aggregates store
+        # comparison_df = aggregates.industry_comparison()
+        
+        # fig = px.bar(
+        #     comparison_df,
+        #     x="Industry",
+        #     y="Solution Count",
+        #     color="Industry",
+        #     title="AI Solution Count by Industry",
+        #     color_discrete_sequence=px.colors.qualitative.Plotly
+        # )
+        # fig.update_layout(height=400, margin=dict(l=40, r=40, t=50, b=40))
+        # fig = set_light_theme(fig)
+        # st.plotly_chart(fig, use_container_width=True)
+        # Display the table in Streamlit
+        st.subheader(f"Service Lines Reaching {selected_industry}")
+        
+        # Service line x industry reach, from the sparse crosswalk built once per data version
+        with perf.span("industry_analysis.crosswalk"):
+            crosswalk = get_crosswalk(matrix)
+            service_lines, reach = crosswalk.service_lines_for(selected_industry)
+        if service_lines:
+            st.dataframe(
+                pd.DataFrame({
+                    "Service Line": service_lines,
+                    "Solutions": reach,
+                    "Through": [", ".join(crosswalk.solutions_between(line, selected_industry)) for line in service_lines],
+                }),
+                hide_index=True,
+                use_container_width=True
+            )
+        else:
+            st.info(f"No service line reaches {selected_industry} through the catalogue's solutions.")
+        if crosswalk.unmatched:
+            st.caption(f"Not in the solution catalogue: {', '.join(crosswalk.unmatched)}")
+        
+        with st.expander("Solution x Service Line Matrix", expanded=False):
+            # Precomputed once per data version; height comes from the cached shape
+            services_table = get_services_table()
+            with perf.span("industry_analysis.dataframe"):
+                st.dataframe(
+                    services_table.frame,
+                    use_container_width=True,
+                    height=services_table.height,
+                    column_config=services_table.column_config
+                )
+        # Add benchmark against industry average
+        avg_solutions = aggregates.mean_solutions_per_industry
+        # st.metric(
+        #     label=f"{selected_industry} vs. Industry Average", 
+        #     value=f"{industry_counts} Solutions",
+        #     delta=f"{industry_counts - avg_solutions:.1f} vs. Avg"
+        # )
 
 def main():
     st.set_page_config(
@@ -153,6 +478,10 @@ def main():
         initial_sidebar_state="expanded"
     )
     
+    perf.maybe_start_metrics_server()
+    edits.maybe_start_compactor()
+    perf.start_rerun()
+    
     apply_custom_css()
     
     # Header with logo and title
@@ -165,19 +494,13 @@ def main():
     
     # Create a loading spinner
     with st.spinner("Loading dashboard..."):
-        time.sleep(0.5)  # Simulate loading time
-        
         # Analytics section
         st.markdown("---")
         colored_header(
             label="Portfolio Overview",
-            description="Key statistics and insights",
-            color_name="blue-70"
+            description="Key statistics and insights"
         )
         
-        # Transformed dataframe for analysis
-        df_analysis = transform_data_for_analysis(df)
-        
         # Overview metrics
         # col1, col2, col3, col4 = st.columns(4)
         # with col1:
@@ -210,45 +533,18 @@ def main():
         # style_metric_cards()
         
         # Sidebar Filters
-        st.sidebar.image("Full_Logo_2_50.jpg", use_container_width=True)
+        # AVIF where the browser supports it, JPEG otherwise; fetched once per browser
+        st.sidebar.markdown(
+            assets.picture(["Full_Logo_2_50.avif", "Full_Logo_2_50.jpg"], alt="NeuronWorks"),
+            unsafe_allow_html=True
+        )
         st.sidebar.title("Dashboard Controls")
         
-        with st.sidebar.expander("🔍 FILTER OPTIONS", expanded=True):
-            industries = list(df.columns[1:])
-            selected_industries = st.multiselect("Select Industries", industries, default=industries)
-            
-            solution_categories = [
-                "All Solutions",
-                "Popular Solutions (3+ industries)",
-                "Specialized Solutions (1-2 industries)"
-            ]
-            solution_category = st.radio("Solution Category", solution_categories)
-            
-            # Filter based on solution category
-            if solution_category == "Popular Solutions (3+ industries)":
-                popular_solutions = df_analysis[df_analysis.iloc[:, 1:].sum(axis=1) >= 3]["AI Solution"].tolist()
-                filtered_solutions = df[df["AI Solution"].isin(popular_solutions)]
-            elif solution_category == "Specialized Solutions (1-2 industries)":
-                specialized_solutions = df_analysis[df_analysis.iloc[:, 1:].sum(axis=1) <= 2]["AI Solution"].tolist()
-                filtered_solutions = df[df["AI Solution"].isin(specialized_solutions)]
-            else:
-                filtered_solutions = df.copy()
-                
-            # Apply industry filter
-            filtered_df = filtered_solutions[['AI Solution'] + selected_industries]
-        
-        with st.sidebar.expander("📊 VISUALIZATION OPTIONS", expanded=False):
-            chart_type = st.selectbox(
-                "Select Chart Type",
-                ["Bar Chart", "Grouped Bar", "Radar Chart"]
-            )
-            
-            color_theme = st.selectbox(
-                "Color Theme",
-                ["Blues", "Viridis", "Plasma", "Reds", "Greens"]
-            )
-            
-            show_percentages = st.checkbox("Show Percentages", value=False)
+        # Only the header is needed here, so the filters render before the matrix is parsed
+        industries = data_source.load_industries()
+        with st.sidebar:
+            filters = render_sidebar_filters(industries)
+        selected_industries = filters["selected_industries"]
         
         with st.sidebar.expander("💡 INSIGHTS", expanded=False):
             st.markdown("""
@@ -265,305 +561,46 @@ def main():
         st.sidebar.markdown("---")
         st.sidebar.markdown("© 2025 NeuronWorks | v1.2.0")
         
+        with perf.span("load_data"):
+            # Canonical boolean matrix, built once per data version and shared read-only
+            matrix = get_matrix()
+            # Picks up cell edits made since the last rerun, in this session or any other
+            edits.sync(matrix)
+            index = get_index(matrix)
+            aggregates = get_aggregates(matrix)
+        
+        with perf.span("filter"):
+            # Each derived value is kept per session and only recomputed when its own inputs change
+            derived = get_derived_state()
+            category_inputs = (matrix.version, filters["solution_category"])
+            solution_rows = derived.value(
+                "solution_rows", category_inputs,
+                lambda: filter_solutions(index, filters["solution_category"])
+            )
+            solution_options = derived.value(
+                "solution_options", category_inputs,
+                lambda: pd.unique(matrix.solutions if solution_rows is None else matrix.solutions[solution_rows])
+            )
+            # Restricts the solution search to the chosen category; None searches everything
+            solution_mask = derived.value(
+                "solution_search_mask", category_inputs,
+                lambda: None if solution_rows is None else get_solution_search(matrix).mask(solution_options)
+            )
+        
         # Main content area with tabs
         tab1, tab2, tab3 = st.tabs(["📊 Solutions Matrix", "🔍 Deep Dive", "📈 Industry Analysis"])
         
         with tab1:
-            st.markdown("### AI Solutions by Industry")
-            st.markdown("This matrix shows which AI solutions can be implemented across different industries")
-                        
-            # Style the dataframe
-            styled_df = filtered_df.set_index("AI Solution")
-            st.dataframe(
-                styled_df, 
-                use_container_width=True,
-                height=400,
-                hide_index=False,
-                column_config={
-                    col: st.column_config.Column(
-                        col,
-                        help=f"AI solutions available for {col}",
-                        width="medium",
-                        required=True
-                    ) for col in styled_df.columns
-                }
+            render_solutions_matrix(
+                matrix, index, aggregates, solution_rows, filters["solution_category"],
+                selected_industries, filters["chart_type"], filters["color_theme"]
             )
-            
-            # Create heatmap visualization
-            if len(selected_industries) > 0:
-                st.markdown("### Solutions Distribution Visualization")
-                
-                df_heatmap = transform_data_for_analysis(filtered_df)
-                
-                if chart_type == "Grouped Bar":
-                    # Create a grouped bar chart
-                    industry_data = []
-                    for industry in df_heatmap.columns[1:]:
-                        available = df_heatmap[df_heatmap[industry] == 1]["AI Solution"].tolist()
-                        for solution in available:
-                            industry_data.append({
-                                "Industry": industry,
-                                "AI Solution": solution,
-                                "Available": 1
-                            })
-                    
-                    if industry_data:
-                        industry_df = pd.DataFrame(industry_data)
-                        fig = px.bar(
-                            industry_df, 
-                            x="Industry", 
-                            y="Available",
-                            color="AI Solution",
-                            title="AI Solutions by Industry",
-                            labels={"Available": "Count", "Industry": "Industry", "AI Solution": "AI Solution"},
-                            color_discrete_sequence=px.colors.qualitative.Plotly
-                        )
-                        fig.update_layout(height=500, margin=dict(l=40, r=40, t=50, b=40), barmode='group')
-                        fig = set_light_theme(fig)
-                        st.plotly_chart(fig, use_container_width=True)
-                    else:
-                        st.info("No data available for visualization with current filters.")
-                    
-                elif chart_type == "Bar Chart":
-                    solutions_count = df_heatmap.iloc[:, 1:].sum(axis=1)
-                    solutions_count = pd.DataFrame({
-                        "AI Solution": df_heatmap["AI Solution"],
-                        "Number of Industries": solutions_count
-                    }).sort_values("Number of Industries", ascending=False)
-                    
-                    fig = px.bar(
-                        solutions_count,
-                        x="AI Solution",
-                        y="Number of Industries",
-                        color="Number of Industries",
-                        color_continuous_scale=color_theme,
-                        title="AI Solutions by Industry Coverage"
-                    )
-                    fig.update_layout(height=500, margin=dict(l=40, r=40, t=50, b=40))
-                    fig = set_light_theme(fig)
-                    st.plotly_chart(fig, use_container_width=True)
-                    
-                elif chart_type == "Radar Chart":
-                    industry_counts = df_heatmap.iloc[:, 1:].sum(axis=0)
-                    industry_counts = pd.DataFrame({
-                        "Industry": industry_counts.index,
-                        "Solution Count": industry_counts.values
-                    })
-                    
-                    fig = px.line_polar(
-                        industry_counts, 
-                        r="Solution Count", 
-                        theta="Industry", 
-                        line_close=True,
-                        color_discrete_sequence=px.colors.sequential.__getattribute__(color_theme)(8),
-                        title="Industry AI Solution Coverage"
-                    )
-                    fig.update_layout(height=500, margin=dict(l=40, r=40, t=50, b=40))
-                    fig = set_light_theme(fig)
-                    st.plotly_chart(fig, use_container_width=True)
-                
+        
         with tab2:
-            # Solution deep-dive section with better UX and visuals
-            st.markdown("### AI Solution Spotlight")
-            st.markdown("Explore individual AI solutions and their industry applications")
-            
-            col1, col2 = st.columns([1, 2])
-            
-            with col1:
-                selected_solution = st.selectbox(
-                    "Select AI Solution", 
-                    filtered_df["AI Solution"].unique(),
-                    key="solution_select"
-                )
-                
-                solution_row = filtered_df[filtered_df["AI Solution"] == selected_solution]
-                solution_industries = [ind for ind in selected_industries if solution_row[ind].values[0] == '✔']
-                
-                st.markdown(f"### {selected_solution}")
-                st.markdown(f"**Industries covered:** {len(solution_industries)}/{len(selected_industries)}")
-                
-                # Coverage percentage
-                coverage = len(solution_industries) / len(selected_industries) * 100
-                st.progress(coverage/100)
-                st.caption(f"{coverage:.1f}% industry coverage")
-                
-                # Add some descriptive text based on the solution
-                solution_descriptions = {
-                    "Chatbot": "AI-powered conversation agents that handle customer inquiries and support",
-                    "IoT": "Internet of Things solutions with AI-powered analytics and decision making",
-                    "Blockchain powered AI systems": "Secure, decentralized AI systems built on blockchain technology",
-                    "Hyperpersonalisation": "Tailored customer experiences based on AI-driven insights",
-                    "Recommendation engine": "Intelligent systems that suggest products or content based on user behavior",
-                    "Social media manager": "AI tools for content scheduling, analysis, and engagement optimization",
-                    "AI adverts": "Automated advertisement creation and optimization for better conversion",
-                    "Ticket handling": "Automated support ticket routing, prioritization, and resolution",
-                    "Review summariser": "AI that extracts insights from customer reviews and feedback",
-                    "Smart data cleaning": "Automated data preparation and cleansing for analytics",
-                    "AI powered SEO engine": "Search optimization tools using natural language processing",
-                    "AI agent copy writer": "Content creation tools for marketing and communications",
-                    "Analytics dashboard": "Customizable data visualization and business intelligence",
-                    "Custom AI/ML solutions": "Bespoke machine learning applications for specific business needs",
-                    "Business analytics and optimisation": "End-to-end business performance analysis and enhancement"
-                }
-                
-                if selected_solution in solution_descriptions:
-                    st.info(solution_descriptions[selected_solution])
-                
-            with col2:
-                # Show industries where this solution is used
-                st.write("### Industry Applications")
-                
-                # Transform the single solution row to a more visual format
-                solution_data = solution_row.melt(
-                    id_vars=["AI Solution"], 
-                    var_name="Industry",
-                    value_name="Available"
-                )
-                solution_data = solution_data[solution_data["Industry"].isin(selected_industries)]
-                
-                # Create a horizontal bar chart
-                solution_data["Value"] = solution_data["Available"].apply(lambda x: 1 if x == "✔" else 0)
-                solution_data = solution_data.sort_values("Value", ascending=False)
-                
-                fig = go.Figure()
-                
-                # Add bars
-                fig.add_trace(go.Bar(
-                    y=solution_data["Industry"],
-                    x=solution_data["Value"],
-                    orientation='h',
-                    marker=dict(
-                        color=solution_data["Value"].map({1: '#22C55E', 0: '#CBD5E1'}),
-                        line=dict(color='rgba(0,0,0,0)', width=1)
-                    ),
-                    hoverinfo='text',
-                    hovertext=solution_data.apply(
-                        lambda x: f"{x['Industry']}: {'Available' if x['Value'] == 1 else 'Not Available'}", 
-                        axis=1
-                    ),
-                    textposition='auto',
-                    text=solution_data["Available"]
-                ))
-                
-                fig.update_layout(
-                    title=f"{selected_solution} Industry Availability",
-                    xaxis=dict(
-                        showgrid=False,
-                        showticklabels=False,
-                        range=[0, 1]
-                    ),
-                    margin=dict(l=20, r=20, t=40, b=20),
-                    height=400
-                )
-                fig = set_light_theme(fig)
-
-                st.plotly_chart(fig, use_container_width=True)
-                
-                # Implementation examples or details
-                st.markdown("#### Implementation Highlights")
-                
-                implementation_examples = {
-                    "Chatbot": [
-                        "Customer service automation reducing response time by 75%",
-                        "Sales qualification increasing conversion rates by 15%",
-                        "24/7 technical support coverage with 92% resolution rate"
-                    ],
-                    "IoT": [
-                        "Predictive maintenance reducing downtime by 35%",
-                        "Supply chain visibility improving delivery accuracy by 22%",
-                        "Smart inventory management reducing holding costs by 18%"
-                    ]
-                }
-                
-                # if selected_solution in implementation_examples:
-                #     for example in implementation_examples[selected_solution]:
-                #         st.markdown(f"✅ {example}")
-                # else:
-                st.markdown("✅ Custom implementation available based on industry requirements")
-                st.markdown("✅ Integration with existing systems and workflows")
-                st.markdown("✅ Continuous improvement through machine learning")
-            
+            render_deep_dive(matrix, solution_options, solution_mask, selected_industries)
+        
         with tab3:
-            # Industry focus
-            st.markdown("### Industry AI Solution Profile")
-            st.markdown("Analyze AI solution coverage by industry vertical")
-            
-            selected_industry = st.selectbox("Select Industry to Analyze", selected_industries)
-            
-            # Create industry profile
-            industry_data = df[["AI Solution", selected_industry]]
-            available_solutions = industry_data[industry_data[selected_industry] == "✔"]["AI Solution"].tolist()
-            
-            col1, col2 = st.columns([1, 2])
-            
-            with col1:
-                st.markdown(f"### {selected_industry}")
-                st.markdown(f"**Solutions available:** {len(available_solutions)}")
-                
-                # Coverage percentage
-                industry_coverage = len(available_solutions) / len(df) * 100
-                # st.progress(industry_coverage/100)
-                # st.caption(f"{industry_coverage:.1f}% solution coverage")
-                
-                # Show the list of available solutions for this industry
-                st.markdown("#### Available AI Solutions")
-                
-                for solution in available_solutions:
-                    st.markdown(f"✅ {solution}")
-                    
-            with col2:
-                # Visualization for industry breakdown
-                df_analysis = transform_data_for_analysis(df)
-                industry_counts = df_analysis[selected_industry].sum()
-                other_industries = [ind for ind in df_analysis.columns[1:] if ind != selected_industry]
-                
-                comparison_data = []
-                for industry in other_industries:
-                    count = df_analysis[industry].sum()
-                    comparison_data.append({
-                        "Industry": industry,
-                        "Solution Count": count
-                    })
-                    
-                comparison_df = pd.DataFrame(comparison_data)
-                comparison_df = pd.concat([
-                    pd.DataFrame([{"Industry": selected_industry, "Solution Count": industry_counts}]), 
-                    comparison_df
-                ])
-                comparison_df = comparison_df.sort_values("Solution Count", ascending=False)
-                
-                # fig = px.bar(
-                #     comparison_df,
-                #     x="Industry",
-                #     y="Solution Count",
-                #     color="Industry",
-                #     title="AI Solution Count by Industry",
-                #     color_discrete_sequence=px.colors.qualitative.Plotly
-                # )
-                # fig.update_layout(height=400, margin=dict(l=40, r=40, t=50, b=40))
-                # fig = set_light_theme(fig)
-                # st.plotly_chart(fig, use_container_width=True)
-                # Display the table in Streamlit
-                # if selected_industry == "Ecommerce":
-                st.subheader("Industry Analysis - Ecommerce Sector")
-                
-                # Calculate height dynamically
-                num_rows = len(df_2)
-                table_height = (num_rows + 1) * 35 + 3  # Formula for height
-                
-                st.dataframe(
-                    df_2.set_index(df_2.columns[0])
-                        .style.hide(axis="index")
-                        .set_properties(**{'text-align': 'center'}),
-                    use_container_width=True,
-                    height=table_height  # Dynamically set height
-                )                # Add benchmark against industry average
-                avg_solutions = df_analysis.iloc[:, 1:].sum().mean()
-                # st.metric(
-                #     label=f"{selected_industry} vs. Industry Average", 
-                #     value=f"{industry_counts} Solutions",
-                #     delta=f"{industry_counts - avg_solutions:.1f} vs. Avg"
-                # )
+            render_industry_analysis(matrix, index, aggregates, selected_industries)
         
         # Footer
         st.markdown("---")
@@ -574,6 +611,8 @@ def main():
         #     st.markdown("**Documentation:** [View Solution Guide](https://example.com)")
         # with footer_cols[2]:
         #     st.markdown("**Last updated:** April 2, 2025")
+    
+    perf.finish_rerun()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,54 @@
+import os
+
+import streamlit as st
+from streamlit import runtime
+
+# Static files shipped with the dashboard. They are registered with Streamlit's
+# media endpoint, which serves them under a content-hash URL, so a browser
+# fetches each one once and every rerun only re-sends a short tag.
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+MIMETYPES = {
+    ".css": "text/css",
+    ".avif": "image/avif",
+    ".webp": "image/webp",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+}
+
+
+@st.cache_resource(show_spinner=False)
+def _read(path, mtime_ns):
+    with open(path, "rb") as handle:
+        return handle.read()
+
+
+def asset_bytes(name):
+    path = os.path.join(STATIC_DIR, name)
+    return _read(path, os.stat(path).st_mtime_ns)
+
+
+def asset_url(name):
+    """Content-addressed URL of a file in static/."""
+    mimetype = MIMETYPES[os.path.splitext(name)[1].lower()]
+    url = runtime.get_instance().media_file_mgr.add(asset_bytes(name), mimetype, f"dashboard-asset:{name}")
+    # Relative, so it also resolves when the app is served under server.baseUrlPath
+    return url.lstrip("/")
+
+
+def stylesheet(name):
+    return f'<link rel="stylesheet" href="{asset_url(name)}">'
+
+
+def picture(names, alt, width="100%"):
+    """<picture> offering ``names`` best format first; the browser downloads only the first it supports.
+
+    The last name is the <img> fallback for browsers that support none of the others.
+    """
+    *sources, fallback = names
+    tags = "".join(
+        f'<source srcset="{asset_url(name)}" type="{MIMETYPES[os.path.splitext(name)[1].lower()]}">'
+        for name in sources
+    )
+    return f'<picture>{tags}<img src="{asset_url(fallback)}" alt="{alt}" style="width: {width};"></picture>'
@@ -0,0 +1,359 @@
+"""Multi-session load test for app.py over Streamlit's websocket protocol.
+
+For every catalogue size and session count, starts the app on a fresh local
+Streamlit server and drives N concurrent sessions the way browsers do: each
+opens the websocket, loads the page, then replays scripted widget changes and
+waits for each rerun to finish before sending the next. Widget changes inside
+an st.fragment rerun only that fragment, as in the browser.
+
+Reports throughput, rerun latency percentiles, server RSS (shared after a
+warm-up load, total with N sessions, and per session), and the saturation
+point: the session count after which throughput grows by less than
+--saturation-gain.
+
+    python benchmarks/load_test.py --sizes 1000x50 --sessions 1,2,4,8,16
+    python benchmarks/load_test.py --sizes 10000x200 --sessions 1,4,16,64 --interactions 20 --output load.json
+
+Everything runs on this machine: the server is a child process and the
+sessions are asyncio websocket clients in this one. RSS is read from /proc, so
+memory figures are only reported on Linux.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import streamlit as st  # noqa: E402
+from streamlit.proto.BackMsg_pb2 import BackMsg  # noqa: E402
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg  # noqa: E402
+from tornado.websocket import websocket_connect  # noqa: E402
+
+import data_source  # noqa: E402
+from synthetic import write_catalogue  # noqa: E402
+
+APP_PATH = os.path.join(REPO_ROOT, "app.py")
+DEFAULT_SIZES = ["1000x50", "10000x200"]
+DEFAULT_SESSIONS = [1, 2, 4, 8, 16]
+
+# Widgets each session changes in turn, by key. Every change picks the next
+# option, offset per session so concurrent sessions ask for different views.
+INTERACTIONS = [
+    "chart_type", "solution_select", "color_theme", "industry_select",
+    "similarity_metric", "table_sort", "solution_category",
+]
+
+# Widget value fields of the element types the script changes
+_VALUE_FIELDS = {"selectbox": "int_value", "radio": "int_value"}
+_EARLY_FOR_RERUN = ForwardMsg.ScriptFinishedStatus.Value("FINISHED_EARLY_FOR_RERUN")
+
+
+class Widget:
+    def __init__(self, element_type, proto, fragment_id):
+        self.element_type = element_type
+        self.id = proto.id
+        self.options = list(proto.options)
+        self.fragment_id = fragment_id
+
+
+class Session:
+    """One simulated browser tab on the app's websocket."""
+
+    def __init__(self, url, number, timeout):
+        self.url = url
+        self.number = number
+        self.timeout = timeout
+        self.widgets = {}
+        self.states = {}
+        self.latencies = []
+        self.exceptions = []
+        self.bytes_received = 0
+        self._connection = None
+
+    async def connect(self):
+        self._connection = await websocket_connect(
+            self.url, subprotocols=["streamlit"], max_message_size=1 << 30
+        )
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+
+    async def rerun(self, fragment_id=""):
+        """Request a rerun and wait until the script run it started has finished."""
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.fragment_id = fragment_id
+        for state in self.states.values():
+            msg.rerun_script.widget_states.widgets.add().CopyFrom(state)
+        started = time.perf_counter()
+        await self._connection.write_message(msg.SerializeToString(), binary=True)
+        while True:
+            data = await asyncio.wait_for(self._connection.read_message(), self.timeout)
+            if data is None:
+                raise ConnectionError("server closed the websocket")
+            self.bytes_received += len(data)
+            forward = ForwardMsg()
+            forward.ParseFromString(data)
+            kind = forward.WhichOneof("type")
+            if kind == "delta":
+                self._learn(forward.delta)
+            elif kind == "script_finished" and forward.script_finished != _EARLY_FOR_RERUN:
+                break
+        return time.perf_counter() - started
+
+    def _learn(self, delta):
+        if delta.WhichOneof("type") != "new_element":
+            return
+        element_type = delta.new_element.WhichOneof("type")
+        if element_type == "exception":
+            self.exceptions.append(delta.new_element.exception.message)
+        elif element_type in _VALUE_FIELDS:
+            proto = getattr(delta.new_element, element_type)
+            # Keyed widgets have ids ending in "-<key>"
+            key = proto.id.rpartition("-")[2]
+            self.widgets[key] = Widget(element_type, proto, delta.fragment_id)
+
+    async def change(self, key, step):
+        """Pick the next option of widget ``key``; returns the rerun latency, or None if it is not on the page."""
+        widget = self.widgets.get(key)
+        if widget is None or len(widget.options) < 2:
+            return None
+        state = _widget_state(widget, (self.number + step) % len(widget.options))
+        self.states[widget.id] = state
+        latency = await self.rerun(widget.fragment_id)
+        self.latencies.append(latency)
+        return latency
+
+
+def _widget_state(widget, value):
+    msg = BackMsg()
+    state = msg.rerun_script.widget_states.widgets.add()
+    state.id = widget.id
+    setattr(state, _VALUE_FIELDS[widget.element_type], value)
+    return state
+
+
+async def _run_session(session, interactions, think_time):
+    # The websocket stays open until every session is done, so RSS is measured with all of them live
+    await session.connect()
+    load = await session.rerun()
+    start = time.perf_counter()
+    step = 0
+    for _ in range(interactions):
+        # Skip widgets that are not on the page, e.g. when a filter leaves no solutions
+        for _ in range(len(INTERACTIONS)):
+            key = INTERACTIONS[step % len(INTERACTIONS)]
+            step += 1
+            if await session.change(key, step) is not None:
+                break
+        if think_time:
+            await asyncio.sleep(think_time)
+    return load, start, time.perf_counter()
+
+
+async def _run_level(url, n_sessions, interactions, think_time, timeout, server_pid):
+    sessions = [Session(url, number, timeout) for number in range(n_sessions)]
+    try:
+        runs = await asyncio.gather(*(_run_session(s, interactions, think_time) for s in sessions))
+        rss = rss_mb(server_pid)
+    finally:
+        for session in sessions:
+            session.close()
+    return sessions, runs, rss
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def rss_mb(pid):
+    """Resident set size of ``pid`` in MB, or None where /proc is not available."""
+    try:
+        with open(f"/proc/{pid}/status") as handle:
+            for line in handle:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+class Server:
+    """app.py on a local Streamlit server in a child process."""
+
+    def __init__(self, catalogue, startup_timeout):
+        self.port = free_port()
+        self.log = tempfile.NamedTemporaryFile(prefix="load_test_server_", suffix=".log", delete=False)
+        env = dict(os.environ)
+        env[data_source.SOLUTIONS_SOURCE_ENV] = catalogue
+        self.process = subprocess.Popen(
+            [
+                sys.executable, "-m", "streamlit", "run", APP_PATH,
+                "--server.port", str(self.port),
+                "--server.address", "127.0.0.1",
+                "--server.headless", "true",
+                "--server.fileWatcherType", "none",
+                "--browser.gatherUsageStats", "false",
+            ],
+            cwd=REPO_ROOT, env=env, stdout=self.log, stderr=subprocess.STDOUT,
+        )
+        self._wait_ready(startup_timeout)
+
+    @property
+    def url(self):
+        return f"ws://127.0.0.1:{self.port}/_stcore/stream"
+
+    def _wait_ready(self, timeout):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                break
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/_stcore/health", timeout=1) as response:
+                    if response.status == 200:
+                        return
+            except OSError:
+                time.sleep(0.2)
+        self.stop()
+        with open(self.log.name, errors="replace") as handle:
+            tail = handle.read()[-2000:]
+        raise RuntimeError(f"Streamlit server did not start on port {self.port}:\n{tail}")
+
+    def stop(self):
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.log.close()
+        os.unlink(self.log.name)
+
+
+def _ms(seconds):
+    return round(float(seconds) * 1000, 2)
+
+
+def run_level(catalogue, n_sessions, args):
+    server = Server(catalogue, args.startup_timeout)
+    try:
+        # One page load first, so parsed data and shared caches count as shared memory
+        warmup = Session(server.url, 0, args.timeout)
+
+        async def warm():
+            await warmup.connect()
+            try:
+                return await warmup.rerun()
+            finally:
+                warmup.close()
+
+        cold_load = asyncio.run(warm())
+        shared = rss_mb(server.process.pid)
+        sessions, runs, total = asyncio.run(_run_level(
+            server.url, n_sessions, args.interactions, args.think_ms / 1000, args.timeout, server.process.pid
+        ))
+    finally:
+        server.stop()
+
+    latencies = np.concatenate([s.latencies for s in sessions]) if sessions else np.zeros(0)
+    wall = max(end for _, _, end in runs) - min(start for _, start, _ in runs)
+    loads = np.array([load for load, _, _ in runs])
+    result = {
+        "sessions": n_sessions,
+        "reruns": int(len(latencies)),
+        "throughput_rps": round(len(latencies) / wall, 2) if wall > 0 else None,
+        "p50_ms": _ms(np.percentile(latencies, 50)) if len(latencies) else None,
+        "p95_ms": _ms(np.percentile(latencies, 95)) if len(latencies) else None,
+        "max_ms": _ms(latencies.max()) if len(latencies) else None,
+        "page_load_p95_ms": _ms(np.percentile(loads, 95)),
+        "cold_load_ms": _ms(cold_load),
+        "received_kb_per_session": round(float(np.mean([s.bytes_received for s in sessions])) / 1024, 1),
+        "rss_shared_mb": None if shared is None else round(shared, 1),
+        "rss_total_mb": None if total is None else round(total, 1),
+        "rss_per_session_mb": None if None in (shared, total) else round((total - shared) / n_sessions, 2),
+        "exceptions": sorted({message for s in sessions + [warmup] for message in s.exceptions}),
+    }
+    return result
+
+
+def saturation_point(levels, gain):
+    """Session count after which throughput grows by less than ``gain``, or None if it never levels off."""
+    for current, following in zip(levels, levels[1:]):
+        if current["throughput_rps"] and following["throughput_rps"] < current["throughput_rps"] * (1 + gain):
+            return current["sessions"]
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=",".join(DEFAULT_SIZES),
+                        help="comma-separated solutions x industries sizes (default: %(default)s)")
+    parser.add_argument("--sessions", default=",".join(map(str, DEFAULT_SESSIONS)),
+                        help="comma-separated concurrent session counts, ascending (default: %(default)s)")
+    parser.add_argument("--interactions", type=int, default=10, help="widget changes per session")
+    parser.add_argument("--think-ms", type=float, default=0, help="pause between a session's interactions")
+    parser.add_argument("--saturation-gain", type=float, default=0.1,
+                        help="throughput growth below which the server counts as saturated (default: %(default)s)")
+    parser.add_argument("--timeout", type=float, default=300, help="per-rerun timeout in seconds")
+    parser.add_argument("--startup-timeout", type=float, default=60, help="server start timeout in seconds")
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "dashboard-bench"),
+                        help="where synthetic catalogues are written and reused")
+    parser.add_argument("--output", default="load_test.json", help="JSON results file")
+    args = parser.parse_args(argv)
+    session_counts = sorted({int(n) for n in args.sessions.split(",") if n})
+
+    results = {
+        "environment": {
+            "python": platform.python_version(),
+            "streamlit": st.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "sizes": {},
+    }
+    failed = False
+    for size in args.sizes.split(","):
+        catalogue = write_catalogue(args.data_dir, size)
+        print(f"{size}:", flush=True)
+        print(f"  {'sessions':>8} {'rerun/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'RSS MB':>8} {'MB/session':>10}")
+        levels = []
+        for n_sessions in session_counts:
+            level = run_level(catalogue, n_sessions, args)
+            levels.append(level)
+            print(
+                f"  {n_sessions:>8} {level['throughput_rps'] or 0:>9.1f} {level['p50_ms'] or 0:>9.1f}"
+                f" {level['p95_ms'] or 0:>9.1f} {level['rss_total_mb'] or 0:>8.1f} {level['rss_per_session_mb'] or 0:>10.2f}",
+                flush=True,
+            )
+            for message in level["exceptions"]:
+                failed = True
+                print(f"    app raised: {message}")
+        saturation = saturation_point(levels, args.saturation_gain)
+        results["sizes"][size] = {"levels": levels, "saturation_sessions": saturation}
+        if saturation is None:
+            print(f"  saturation: not reached up to {session_counts[-1]} sessions")
+        else:
+            print(f"  saturation: {saturation} sessions")
+
+    with open(args.output, "w") as handle:
+        json.dump(results, handle, indent=2)
+    print(f"Results written to {args.output}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+"""Headless rerun-latency benchmark for app.py.
+
+Drives the dashboard through streamlit.testing.v1.AppTest with scripted widget
+interactions against synthetic catalogues, and reports p50/p95 rerun latency
+and peak traced memory per scenario.
+
+    python benchmarks/rerun_latency.py --sizes 15x12,1000x50 --output results.json
+    python benchmarks/rerun_latency.py --baseline results.json --threshold 0.25
+
+With --baseline, the run exits non-zero if any scenario's p95 latency is more
+than --threshold (a fraction) slower than in the baseline file.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import streamlit as st  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import data_source  # noqa: E402
+from app import CHART_TYPES, COLOR_THEMES, SOLUTION_CATEGORIES  # noqa: E402
+from synthetic import DEFAULT_SIZES, write_catalogue  # noqa: E402
+
+APP_PATH = os.path.join(REPO_ROOT, "app.py")
+
+
+def _options(at, key, limit):
+    options = list(at.selectbox(key=key).options)
+    step = max(1, len(options) // limit)
+    return options[::step][:limit]
+
+
+# Each scenario yields a sequence of interactions; every interaction is one
+# widget change followed by one timed rerun
+def toggle_industries(at, limit):
+    industries = list(at.multiselect(key="selected_industries").options)
+    half = industries[: max(1, len(industries) // 2)]
+    for _ in range(limit):
+        yield lambda: at.multiselect(key="selected_industries").set_value(half)
+        yield lambda: at.multiselect(key="selected_industries").set_value(industries)
+
+
+def switch_chart_type(at, limit):
+    for chart_type in CHART_TYPES[1:] + CHART_TYPES[:1]:
+        yield lambda chart_type=chart_type: at.selectbox(key="chart_type").set_value(chart_type)
+
+
+def switch_color_theme(at, limit):
+    for theme in COLOR_THEMES[1:] + COLOR_THEMES[:1]:
+        yield lambda theme=theme: at.selectbox(key="color_theme").set_value(theme)
+
+
+def switch_category(at, limit):
+    for category in SOLUTION_CATEGORIES[1:] + SOLUTION_CATEGORIES[:1]:
+        yield lambda category=category: at.radio(key="solution_category").set_value(category)
+
+
+def pick_solution(at, limit):
+    for solution in _options(at, "solution_select", limit):
+        yield lambda solution=solution: at.selectbox(key="solution_select").set_value(solution)
+
+
+def pick_industry(at, limit):
+    for industry in _options(at, "industry_select", limit):
+        yield lambda industry=industry: at.selectbox(key="industry_select").set_value(industry)
+
+
+SCENARIOS = {
+    "toggle_industries": toggle_industries,
+    "chart_type": switch_chart_type,
+    "color_theme": switch_color_theme,
+    "solution_category": switch_category,
+    "deep_dive_solution": pick_solution,
+    "industry_analysis": pick_industry,
+}
+
+
+def _app(timeout):
+    os.chdir(REPO_ROOT)
+    return AppTest.from_file(APP_PATH, default_timeout=timeout)
+
+
+def _check(at, label):
+    if at.exception:
+        raise RuntimeError(f"{label}: app raised {at.exception[0].message}")
+
+
+def run_scenario(name, at, limit):
+    latencies = []
+    for interact in SCENARIOS[name](at, limit):
+        interact()
+        start = time.perf_counter()
+        at.run()
+        latencies.append(time.perf_counter() - start)
+        _check(at, name)
+    return latencies
+
+
+def traced_peak(name, timeout, limit):
+    """Peak traced allocation of one scenario pass, measured on a warm cache."""
+    at = _app(timeout)
+    at.run()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    try:
+        run_scenario(name, at, limit)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def summarize(latencies):
+    ms = np.asarray(latencies) * 1000.0
+    return {
+        "runs": len(ms),
+        "p50_ms": round(float(np.percentile(ms, 50)), 2),
+        "p95_ms": round(float(np.percentile(ms, 95)), 2),
+        "mean_ms": round(float(ms.mean()), 2),
+        "max_ms": round(float(ms.max()), 2),
+    }
+
+
+def benchmark_size(size, data_dir, scenarios, repeat, limit, timeout, measure_memory):
+    path = write_catalogue(data_dir, size)
+    os.environ[data_source.SOLUTIONS_SOURCE_ENV] = path
+    # Every size starts from a cold process-wide cache
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+    at = _app(timeout)
+    start = time.perf_counter()
+    at.run()
+    cold_ms = (time.perf_counter() - start) * 1000.0
+    _check(at, "initial load")
+    start = time.perf_counter()
+    at.run()
+    warm_ms = (time.perf_counter() - start) * 1000.0
+
+    results = {"cold_start_ms": round(cold_ms, 2), "warm_rerun_ms": round(warm_ms, 2), "scenarios": {}}
+    for name in scenarios:
+        latencies = []
+        for _ in range(repeat):
+            latencies += run_scenario(name, at, limit)
+        summary = summarize(latencies)
+        if measure_memory:
+            summary["peak_traced_mb"] = round(traced_peak(name, timeout, limit) / 2**20, 2)
+        results["scenarios"][name] = summary
+        print(f"  {name:<20} p50 {summary['p50_ms']:>9.1f} ms  p95 {summary['p95_ms']:>9.1f} ms", flush=True)
+    return results
+
+
+def regressions(results, baseline, threshold):
+    failures = []
+    for size, entry in results["sizes"].items():
+        base_entry = baseline.get("sizes", {}).get(size)
+        if base_entry is None:
+            continue
+        for name, summary in entry["scenarios"].items():
+            base = base_entry["scenarios"].get(name)
+            if base and summary["p95_ms"] > base["p95_ms"] * (1 + threshold):
+                failures.append(f"{size} {name}: p95 {summary['p95_ms']} ms vs baseline {base['p95_ms']} ms")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=",".join(DEFAULT_SIZES),
+                        help="comma-separated solutions x industries sizes (default: %(default)s)")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help="comma-separated scenarios to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="passes over each scenario")
+    parser.add_argument("--limit", type=int, default=5, help="max picks per selection scenario")
+    parser.add_argument("--timeout", type=float, default=600, help="per-rerun timeout in seconds")
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "dashboard-bench"),
+                        help="where synthetic catalogues are written and reused")
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced-memory pass")
+    parser.add_argument("--output", default="rerun_latency.json", help="JSON results file")
+    parser.add_argument("--baseline", help="results file to compare p95 latencies against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed p95 slowdown vs baseline, as a fraction (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    scenarios = [name for name in args.scenarios.split(",") if name]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    results = {
+        "environment": {
+            "python": platform.python_version(),
+            "streamlit": st.__version__,
+            "platform": platform.platform(),
+        },
+        "sizes": {},
+    }
+    for size in args.sizes.split(","):
+        print(f"{size}:", flush=True)
+        results["sizes"][size] = benchmark_size(
+            size, args.data_dir, scenarios, args.repeat, args.limit, args.timeout, not args.no_memory
+        )
+
+    with open(args.output, "w") as handle:
+        json.dump(results, handle, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            failures = regressions(results, json.load(handle), args.threshold)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
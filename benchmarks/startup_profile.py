@@ -0,0 +1,135 @@
+"""Cold-start profile for app.py, with an enforceable budget.
+
+Each measurement runs in a fresh interpreter, the way a new server pod would:
+import time per module from ``python -X importtime -c "import app"``, and the
+wall time of the first full render through streamlit.testing.v1.AppTest.
+
+    python benchmarks/startup_profile.py
+    python benchmarks/startup_profile.py --import-budget-ms 1500 --render-budget-ms 4000
+
+The run exits non-zero if a budget is exceeded or if a module listed with
+--deferred (plotly.express by default) is already loaded after ``import app``.
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(REPO_ROOT, "app.py")
+
+# Budgets may also come from the environment, e.g. in the deployment pipeline
+IMPORT_BUDGET_ENV = "DASHBOARD_IMPORT_BUDGET_MS"
+RENDER_BUDGET_ENV = "DASHBOARD_FIRST_RENDER_BUDGET_MS"
+
+# Chart libraries that must not be loaded until a chart is rendered
+DEFAULT_DEFERRED = ["plotly.express"]
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+_FIRST_RENDER = """
+import json, os, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+os.chdir({root!r})
+at = AppTest.from_file({app!r}, default_timeout={timeout})
+ready = time.perf_counter()
+at.run()
+done = time.perf_counter()
+print(json.dumps({{
+    "harness_ms": (ready - start) * 1000,
+    "first_render_ms": (done - ready) * 1000,
+    "exceptions": [e.message for e in at.exception],
+}}))
+"""
+
+
+def _python(args, env=None):
+    return subprocess.run(
+        [sys.executable] + args, cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+
+
+def profile_imports(deferred):
+    """Per-module import times of ``import app``, and which deferred modules got loaded."""
+    check = f"import app, json, sys; print(json.dumps([m for m in {deferred!r} if m in sys.modules]))"
+    result = _python(["-X", "importtime", "-c", check])
+    modules = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append({
+                "module": name,
+                "depth": len(indent) // 2,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+            })
+    total = next((m["cumulative_ms"] for m in modules if m["module"] == "app"), None)
+    return {"import_ms": total, "modules": modules, "loaded_deferred": json.loads(result.stdout)}
+
+
+def profile_first_render(timeout, env):
+    result = _python(["-c", _FIRST_RENDER.format(root=REPO_ROOT, app=APP_PATH, timeout=timeout)], env=env)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _budget(value, env_var):
+    if value is not None:
+        return value
+    return float(os.environ[env_var]) if os.environ.get(env_var) else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=15, help="slowest direct imports of app to list")
+    parser.add_argument("--deferred", default=",".join(DEFAULT_DEFERRED),
+                        help="comma-separated modules that must not load at import time (default: %(default)s)")
+    parser.add_argument("--import-budget-ms", type=float, help=f"max time for 'import app' (or ${IMPORT_BUDGET_ENV})")
+    parser.add_argument("--render-budget-ms", type=float, help=f"max first render time (or ${RENDER_BUDGET_ENV})")
+    parser.add_argument("--timeout", type=float, default=120, help="first render timeout in seconds")
+    parser.add_argument("--output", help="optional JSON results file")
+    args = parser.parse_args(argv)
+
+    deferred = [name for name in args.deferred.split(",") if name]
+    imports = profile_imports(deferred)
+    render = profile_first_render(args.timeout, dict(os.environ))
+
+    direct = sorted((m for m in imports["modules"] if m["depth"] == 1), key=lambda m: -m["cumulative_ms"])
+    print(f"import app: {imports['import_ms']:.1f} ms")
+    for module in direct[:args.top]:
+        print(f"  {module['module']:<40} {module['cumulative_ms']:>9.1f} ms")
+    print(f"first render: {render['first_render_ms']:.1f} ms (test harness import {render['harness_ms']:.1f} ms)")
+
+    failures = []
+    if render["exceptions"]:
+        failures.append(f"first render raised: {render['exceptions'][0]}")
+    for name in imports["loaded_deferred"]:
+        failures.append(f"{name} is imported at startup")
+    import_budget = _budget(args.import_budget_ms, IMPORT_BUDGET_ENV)
+    if import_budget is not None and imports["import_ms"] > import_budget:
+        failures.append(f"import app took {imports['import_ms']:.1f} ms, budget {import_budget:.0f} ms")
+    render_budget = _budget(args.render_budget_ms, RENDER_BUDGET_ENV)
+    if render_budget is not None and render["first_render_ms"] > render_budget:
+        failures.append(f"first render took {render['first_render_ms']:.1f} ms, budget {render_budget:.0f} ms")
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump({
+                "environment": {"python": platform.python_version(), "platform": platform.platform()},
+                "imports": imports,
+                "first_render": render,
+                "failures": failures,
+            }, handle, indent=2)
+        print(f"Results written to {args.output}")
+
+    for failure in failures:
+        print(f"BUDGET {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+"""Synthetic portfolio catalogues for the benchmark and load-test scripts.
+
+Catalogues are written as Parquet files in the same layout as the real
+solutions source (an "AI Solution" column followed by one "✔"/"" column per
+industry) and can be plugged into the app with PORTFOLIO_SOLUTIONS_SOURCE.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_SIZES = ["15x12", "1000x50", "10000x200", "100000x1000"]
+
+
+def parse_size(size):
+    """Parse "1000x50" into (1000, 50)."""
+    n_solutions, _, n_industries = size.lower().partition("x")
+    return int(n_solutions), int(n_industries)
+
+
+def make_catalogue(n_solutions, n_industries, density=0.05, seed=0):
+    rng = np.random.default_rng(seed)
+    # Skewed per-industry density so coverage filters and rankings are not uniform
+    industry_density = np.clip(rng.gamma(2.0, density / 2.0, size=n_industries), 0.001, 0.9)
+    data = {"AI Solution": [f"Solution {i:06d}" for i in range(n_solutions)]}
+    for j in range(n_industries):
+        data[f"Industry {j:04d}"] = np.where(rng.random(n_solutions) < industry_density[j], "✔", "")
+    return pd.DataFrame(data)
+
+
+def write_catalogue(directory, size, density=0.05, seed=0):
+    """Write (or reuse) the catalogue for ``size`` under ``directory`` and return its path."""
+    n_solutions, n_industries = parse_size(size)
+    path = os.path.join(directory, f"catalogue_{n_solutions}x{n_industries}_{density}_{seed}.parquet")
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        make_catalogue(n_solutions, n_industries, density, seed).to_parquet(path, index=False)
+    return path
@@ -0,0 +1,141 @@
+import numpy as np
+import streamlit as st
+
+from matrix import PortfolioMatrix, get_matrix
+
+# Popcount of every byte value, used when NumPy has no bitwise_count (< 2.0)
+_BYTE_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def pack_bits(mask, axis=-1):
+    """Pack a boolean array along ``axis`` into little-endian uint64 words."""
+    mask = np.moveaxis(np.asarray(mask, dtype=bool), axis, -1)
+    packed = np.packbits(mask, axis=-1, bitorder="little")
+    pad = -packed.shape[-1] % 8
+    if pad:
+        packed = np.pad(packed, [(0, 0)] * (packed.ndim - 1) + [(0, pad)])
+    return np.ascontiguousarray(packed).view(np.uint64)
+
+
+def assign_bit(words, position, value):
+    """Set or clear bit ``position`` of a packed uint64 bit-vector in place."""
+    word, bit = divmod(int(position), 64)
+    mask = np.uint64(1) << np.uint64(bit)
+    if value:
+        words[word] |= mask
+    else:
+        words[word] &= ~mask
+
+
+def bit_counts(words):
+    """Number of set bits in each uint64 word, as uint8."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words)
+    bytes_ = np.ascontiguousarray(words).view(np.uint8).reshape(words.shape + (8,))
+    return _BYTE_POPCOUNT[bytes_].sum(axis=-1, dtype=np.uint8)
+
+
+def popcount(words, axis=-1):
+    """Number of set bits in ``words``, summed along ``axis``."""
+    return bit_counts(words).sum(axis=axis, dtype=np.int64)
+
+
+class BitsetIndex:
+    """Inverted index over the portfolio matrix with one bit-vector per industry and per solution.
+
+    Solution sets are passed around as packed uint64 bit-vectors, so AND/OR/NOT
+    queries and counts cost one operation per 64 solutions.
+    """
+
+    def __init__(self, matrix):
+        self.cache_key = matrix.cache_key
+        self.n_solutions, self.n_industries = matrix.shape
+        self.industry_index = matrix.industry_index
+        # Row i holds the solutions available in industry i
+        self.by_industry = pack_bits(matrix.values, axis=0)
+        # Row i holds the industries covered by solution i
+        self.by_solution = pack_bits(matrix.values, axis=1)
+        self.coverage = popcount(self.by_solution)
+        # Bits past n_solutions in the last word must stay clear for NOT and popcounts
+        self._universe = pack_bits(np.ones(self.n_solutions, dtype=bool))
+        self._at_least = {}
+
+    def set_cell(self, row, column, value):
+        """Apply one changed matrix cell to every bit-vector, count and memo."""
+        assign_bit(self.by_industry[column], row, value)
+        assign_bit(self.by_solution[row], column, value)
+        self.coverage[row] += 1 if value else -1
+        for threshold, bits in self._at_least.items():
+            bits.flags.writeable = True
+            assign_bit(bits, row, self.coverage[row] >= threshold)
+            bits.flags.writeable = False
+
+    def all(self):
+        return self._universe.copy()
+
+    def industry(self, name):
+        return self.by_industry[self.industry_index[name]]
+
+    def any_of(self, industries):
+        """Solutions available in at least one of ``industries``."""
+        if not industries:
+            return np.zeros_like(self._universe)
+        rows = [self.industry_index[name] for name in industries]
+        return np.bitwise_or.reduce(self.by_industry[rows], axis=0)
+
+    def all_of(self, industries):
+        """Solutions available in every one of ``industries``."""
+        if not industries:
+            return self.all()
+        rows = [self.industry_index[name] for name in industries]
+        return np.bitwise_and.reduce(self.by_industry[rows], axis=0)
+
+    def coverage_in(self, industries):
+        """Per-solution count of covered industries, restricted to ``industries``."""
+        if len(industries) == self.n_industries:
+            return self.coverage
+        mask = np.zeros(self.n_industries, dtype=bool)
+        mask[[self.industry_index[name] for name in industries]] = True
+        return popcount(self.by_solution & pack_bits(mask))
+
+    def negate(self, bits):
+        return ~bits & self._universe
+
+    def coverage_at_least(self, threshold):
+        """Solutions covering ``threshold`` or more industries; memoized per threshold."""
+        bits = self._at_least.get(threshold)
+        if bits is None:
+            bits = pack_bits(self.coverage >= threshold)
+            bits.flags.writeable = False
+            self._at_least[threshold] = bits
+        return bits
+
+    def coverage_between(self, low, high):
+        """Solutions covering between ``low`` and ``high`` industries inclusive."""
+        return self.coverage_at_least(low) & ~self.coverage_at_least(high + 1)
+
+    def count(self, bits):
+        return int(popcount(bits))
+
+    def positions(self, bits):
+        """Row positions of the set bits, in matrix order."""
+        mask = np.unpackbits(bits.view(np.uint8), count=self.n_solutions, bitorder="little")
+        return np.flatnonzero(mask)
+
+    def solutions_for(self, industry):
+        """Row positions of the solutions available in ``industry``."""
+        return self.positions(self.industry(industry))
+
+
+@st.cache_resource(show_spinner=False, max_entries=4, hash_funcs={PortfolioMatrix: lambda m: m.cache_key})
+def _build_index(matrix):
+    # Built and subscribed under the edit lock so no edit falls between the two
+    with matrix.edit_lock:
+        index = BitsetIndex(matrix)
+        matrix.subscribe(index.set_cell)
+    return index
+
+
+def get_index(matrix=None):
+    """The bitset index for the current data version."""
+    return _build_index(matrix if matrix is not None else get_matrix())
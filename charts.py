@@ -0,0 +1,357 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import perf
+
+# Plotly is imported inside the builders, so it is only loaded once a chart is
+# actually rendered rather than when the app starts.
+
+
+def set_light_theme(fig):
+    with perf.span("set_light_theme"):
+        return _set_light_theme(fig)
+
+def _set_light_theme(fig):
+    fig.update_layout(
+        template="plotly_white",
+        paper_bgcolor="white",
+        plot_bgcolor="white",
+        font=dict(color="black"),  # Set all text to black
+        margin=dict(l=40, r=40, t=50, b=40),
+        xaxis=dict(
+            showgrid=True,
+            gridcolor="lightgray",  # Light gray grid for visibility
+            tickfont=dict(color="black"),  # X-axis labels in black
+            title=dict(text="Our offerings", font=dict(color="black"))  # X-axis title in black
+        ),
+        yaxis=dict(
+            showgrid=True,
+            gridcolor="lightgray",
+            tickfont=dict(color="black"),  # Y-axis labels in black
+            title=dict(text="Number of possible ventures", font=dict(color="black"))  # Y-axis title in black
+        ),
+    )
+    return fig
+
+# Figure builders for the Solutions Matrix tab; distribution_figure() picks the
+# builder for the chart type and feeds it. Each returns a themed figure, or None
+# when there is nothing to plot.
+
+# Above this many (solution, industry) bars the grouped chart switches to the
+# aggregated view: the top solutions by coverage plus one "Other solutions" bucket.
+# Can be overridden from the environment like the limits below.
+GROUPED_BAR_MAX_BARS_ENV = "CHART_GROUPED_BAR_MAX_BARS"
+DEFAULT_GROUPED_BAR_MAX_BARS = 1500
+GROUPED_BAR_TOP_N = 20
+OTHER_SOLUTIONS = "Other solutions"
+OTHER_INDUSTRIES = "Other industries"
+
+# Past each of these sizes a chart switches to a rendering mode whose payload no
+# longer grows with the data. All of them can be overridden from the environment.
+# Coverage bars: above this many solutions, the top ones plus an averaged "other" bar
+BAR_MAX_BARS_ENV = "CHART_BAR_MAX_BARS"
+DEFAULT_BAR_MAX_BARS = 200
+BAR_TOP_N = 50
+# Radar: WebGL above the first size, the top industries plus an averaged "other" point above the second
+RADAR_WEBGL_POINTS_ENV = "CHART_RADAR_WEBGL_POINTS"
+DEFAULT_RADAR_WEBGL_POINTS = 100
+RADAR_MAX_POINTS_ENV = "CHART_RADAR_MAX_POINTS"
+DEFAULT_RADAR_MAX_POINTS = 360
+RADAR_TOP_N = 60
+# Grouped bars: above this many matrix cells, a density map of the whole matrix binned server-side
+DENSITY_MIN_CELLS_ENV = "CHART_DENSITY_MIN_CELLS"
+DEFAULT_DENSITY_MIN_CELLS = 100_000
+DENSITY_SOLUTION_BINS = 120
+DENSITY_INDUSTRY_BINS = 60
+# Deep Dive availability: above this many industries, the first ones plus summary bars
+AVAILABILITY_MAX_BARS_ENV = "CHART_AVAILABILITY_MAX_BARS"
+DEFAULT_AVAILABILITY_MAX_BARS = 60
+
+def chart_limit(env_var, default):
+    return int(os.environ.get(env_var, default))
+
+def top_n_with_other(labels, values, order, top_n, other_label):
+    """The first ``top_n`` of ``order`` plus one entry averaging all the others."""
+    labels = np.asarray(labels, dtype=object)
+    values = np.asarray(values)
+    top, rest = order[:top_n], order[top_n:]
+    if len(rest) == 0:
+        return labels[top], values[top]
+    other = f"{other_label} ({len(rest):,}, average)"
+    return (
+        np.append(labels[top], other).astype(object),
+        np.append(values[top].astype(np.float64), values[rest].mean()),
+    )
+
+def bin_edges(n, bins):
+    """Start of each of at most ``bins`` near-equal consecutive groups of ``n`` items, and the end."""
+    return np.unique(np.linspace(0, n, min(n, bins) + 1).astype(np.int64))
+
+def density_figure(block, solutions, industries, color_theme):
+    """Heatmap of the share of available cells per (solution bin, industry bin).
+
+    Solutions are ranked by coverage before binning, so the map reads like the
+    sorted matrix at a fixed resolution whatever the catalogue size.
+    """
+    solutions = np.asarray(solutions, dtype=object)
+    industries = np.asarray(industries, dtype=object)
+    order = np.argsort(-block.sum(axis=1), kind="stable")
+    rows, columns = bin_edges(len(order), DENSITY_SOLUTION_BINS), bin_edges(len(industries), DENSITY_INDUSTRY_BINS)
+    counts = np.add.reduceat(block[order], rows[:-1], axis=0, dtype=np.int64)
+    counts = np.add.reduceat(counts, columns[:-1], axis=1)
+    # Whole percentages are plenty for a color scale, and as uint8 they are one byte per cell on the wire
+    share = np.rint(100 * counts / np.outer(np.diff(rows), np.diff(columns))).astype(np.uint8)
+
+    def labels(names, edges):
+        return [
+            names[start] if stop - start == 1 else f"{names[start]} … {names[stop - 1]} ({stop - start})"
+            for start, stop in zip(edges[:-1], edges[1:])
+        ]
+
+    import plotly.graph_objects as go
+    fig = go.Figure(go.Heatmap(
+        z=share,
+        x=labels(industries, columns),
+        y=labels(solutions[order], rows),
+        zmin=0,
+        zmax=100,
+        colorscale=color_theme,
+        colorbar=dict(title="Available", ticksuffix="%"),
+        hovertemplate="%{y}<br>%{x}<br>Available: %{z}%<extra></extra>"
+    ))
+    fig.update_layout(
+        title=f"AI Solution Density by Industry ({len(solutions):,} solutions, most covered at the top)",
+        height=500,
+        margin=dict(l=40, r=40, t=50, b=40),
+        yaxis=dict(autorange="reversed", showticklabels=False),
+    )
+    fig = set_light_theme(fig)
+    # The themed axis titles describe bar charts; the density map labels its own axes
+    fig.update_layout(xaxis_title="Industry", yaxis_title="AI Solutions by coverage rank")
+    return fig
+
+def grouped_bar_long_format(df_heatmap):
+    """One row per available (industry, solution) pair, ordered by industry then solution."""
+    block = df_heatmap.iloc[:, 1:].to_numpy(dtype=bool)
+    # Transposing first makes nonzero() walk industries in the outer loop
+    industry_pos, solution_pos = np.nonzero(block.T)
+    return pd.DataFrame({
+        "Industry": df_heatmap.columns[1:].to_numpy()[industry_pos],
+        "AI Solution": df_heatmap["AI Solution"].to_numpy()[solution_pos],
+        "Available": np.ones(len(solution_pos), dtype=np.int64)
+    })
+
+def grouped_bar_aggregated(df_heatmap, top_n=GROUPED_BAR_TOP_N):
+    """Per-industry counts for the top_n widest-reaching solutions plus an "other" bucket."""
+    block = df_heatmap.iloc[:, 1:].to_numpy(dtype=bool)
+    industries = df_heatmap.columns[1:].to_numpy()
+    coverage = block.sum(axis=1)
+    top = np.argsort(-coverage, kind="stable")[:top_n]
+    top = top[coverage[top] > 0]
+    rest = np.ones(len(block), dtype=bool)
+    rest[top] = False
+
+    frames = []
+    if len(top):
+        top_block = block[top]
+        solution_pos, industry_pos = np.nonzero(top_block)
+        frames.append(pd.DataFrame({
+            "Industry": industries[industry_pos],
+            "AI Solution": df_heatmap["AI Solution"].to_numpy()[top][solution_pos],
+            "Available": np.ones(len(solution_pos), dtype=np.int64)
+        }))
+    other_counts = block[rest].sum(axis=0)
+    if other_counts.any():
+        frames.append(pd.DataFrame({
+            "Industry": industries[other_counts > 0],
+            "AI Solution": OTHER_SOLUTIONS,
+            "Available": other_counts[other_counts > 0]
+        }))
+    if not frames:
+        return pd.DataFrame(columns=["Industry", "AI Solution", "Available"])
+    return pd.concat(frames, ignore_index=True)
+
+def grouped_bar_figure(df_heatmap, color_theme, max_bars=None, top_n=GROUPED_BAR_TOP_N):
+    # Create a grouped bar chart, aggregating once the bar count would stall the browser
+    n_bars = int(df_heatmap.iloc[:, 1:].to_numpy().sum())
+    if n_bars == 0:
+        return None
+    if max_bars is None:
+        max_bars = chart_limit(GROUPED_BAR_MAX_BARS_ENV, DEFAULT_GROUPED_BAR_MAX_BARS)
+
+    aggregated = n_bars > max_bars
+    if aggregated:
+        industry_df = grouped_bar_aggregated(df_heatmap, top_n)
+        title = f"AI Solutions by Industry (top {top_n} solutions, others grouped)"
+    else:
+        industry_df = grouped_bar_long_format(df_heatmap)
+        title = "AI Solutions by Industry"
+
+    import plotly.express as px
+    fig = px.bar(
+        industry_df,
+        x="Industry",
+        y="Available",
+        color="AI Solution",
+        title=title,
+        labels={"Available": "Count", "Industry": "Industry", "AI Solution": "AI Solution"},
+        color_discrete_sequence=px.colors.qualitative.Plotly
+    )
+    fig.update_layout(height=500, margin=dict(l=40, r=40, t=50, b=40), barmode='group')
+    return set_light_theme(fig)
+
+def coverage_bar_figure(solutions, counts, color_theme, order=None):
+    # ``order`` is a precomputed most-covered-first ordering; sorted here when absent
+    if order is None:
+        order = np.argsort(-np.asarray(counts), kind="stable")
+    title = "AI Solutions by Industry Coverage"
+    if len(order) > chart_limit(BAR_MAX_BARS_ENV, DEFAULT_BAR_MAX_BARS):
+        labels, values = top_n_with_other(solutions, counts, order, BAR_TOP_N, OTHER_SOLUTIONS)
+        title = f"AI Solutions by Industry Coverage (top {BAR_TOP_N} of {len(order):,})"
+    else:
+        labels, values = np.asarray(solutions, dtype=object)[order], np.asarray(counts)[order]
+    solutions_count = pd.DataFrame({
+        "AI Solution": labels,
+        "Number of Industries": values
+    })
+
+    import plotly.express as px
+    fig = px.bar(
+        solutions_count,
+        x="AI Solution",
+        y="Number of Industries",
+        color="Number of Industries",
+        color_continuous_scale=color_theme,
+        title=title
+    )
+    fig.update_layout(height=500, margin=dict(l=40, r=40, t=50, b=40))
+    return set_light_theme(fig)
+
+def radar_figure(industries, counts, color_theme):
+    counts = np.asarray(counts)
+    title = "Industry AI Solution Coverage"
+    if len(counts) > chart_limit(RADAR_MAX_POINTS_ENV, DEFAULT_RADAR_MAX_POINTS):
+        order = np.argsort(-counts, kind="stable")
+        industries, counts = top_n_with_other(industries, counts, order, RADAR_TOP_N, OTHER_INDUSTRIES)
+        title = f"Industry AI Solution Coverage (top {RADAR_TOP_N} of {len(order):,})"
+    industry_counts = pd.DataFrame({
+        "Industry": list(industries),
+        "Solution Count": counts
+    })
+
+    import plotly.express as px
+    # A single line: the light end of Blues, Reds or Greens would vanish on the white background
+    line_color = px.colors.sample_colorscale(color_theme, [0.8])[0]
+    if len(counts) > chart_limit(RADAR_WEBGL_POINTS_ENV, DEFAULT_RADAR_WEBGL_POINTS):
+        # SVG polar lines stall well before the top-N cut-off, so larger radars are
+        # drawn with WebGL; px.line_polar cannot close a WebGL line, so it is built here
+        import plotly.graph_objects as go
+        theta = np.append(industry_counts["Industry"].to_numpy(), industry_counts["Industry"].iloc[0])
+        fig = go.Figure(go.Scatterpolargl(
+            r=np.append(counts, counts[0]),
+            theta=theta,
+            mode="lines",
+            line=dict(color=line_color),
+            hovertemplate="Industry=%{theta}<br>Solution Count=%{r}<extra></extra>"
+        ))
+        fig.update_layout(title=title)
+    else:
+        fig = px.line_polar(
+            industry_counts,
+            r="Solution Count",
+            theta="Industry",
+            line_close=True,
+            color_discrete_sequence=[line_color],
+            title=title
+        )
+    fig.update_layout(height=500, margin=dict(l=40, r=40, t=50, b=40))
+    return set_light_theme(fig)
+
+def distribution_figure(matrix, index, aggregates, solution_rows, selected_industries, chart_type, color_theme):
+    """Build the Solutions Matrix chart for one view.
+
+    Counts come from the aggregates store whenever the view covers the whole
+    catalogue along the counted axis; only narrower views are counted here.
+    """
+    all_solutions = solution_rows is None
+    all_industries = len(selected_industries) == matrix.shape[1]
+    if chart_type == "Bar Chart":
+        if all_industries:
+            counts = aggregates.solution_coverage
+            if all_solutions:
+                return coverage_bar_figure(matrix.solutions, counts, color_theme, aggregates.solutions.descending())
+        else:
+            counts = index.coverage_in(selected_industries)
+        if all_solutions:
+            return coverage_bar_figure(matrix.solutions, counts, color_theme)
+        return coverage_bar_figure(matrix.solutions[solution_rows], counts[solution_rows], color_theme)
+    if chart_type == "Radar Chart":
+        if all_solutions:
+            counts = aggregates.industry_counts[matrix.industry_positions(selected_industries)]
+        else:
+            counts = matrix.select(solution_rows, selected_industries).sum(axis=0)
+        return radar_figure(selected_industries, counts, color_theme)
+    n_solutions = matrix.shape[0] if all_solutions else len(solution_rows)
+    if n_solutions * len(selected_industries) > chart_limit(DENSITY_MIN_CELLS_ENV, DEFAULT_DENSITY_MIN_CELLS):
+        block = matrix.select(solution_rows, selected_industries)
+        if not block.any():
+            return None
+        solutions = matrix.solutions if all_solutions else matrix.solutions[solution_rows]
+        return density_figure(block, solutions, selected_industries, color_theme)
+    return grouped_bar_figure(matrix.analysis_frame(solution_rows, selected_industries), color_theme)
+
+def solution_availability_figure(selected_solution, industries, available):
+    # Available industries first, keeping the selection order within each group
+    order = np.argsort(~np.asarray(available, dtype=bool), kind="stable")
+    industries = np.asarray(industries, dtype=object)[order]
+    values = np.asarray(available, dtype=np.int64)[order]
+    colors = np.where(values == 1, '#22C55E', '#CBD5E1').astype(object)
+    text = np.where(values == 1, "✔", "").astype(object)
+    hovertext = industries + np.where(values == 1, ": Available", ": Not Available").astype(object)
+
+    # Past the limit, the remaining industries collapse into one full-length
+    # summary bar per availability, colored like the bars they stand for
+    max_bars = chart_limit(AVAILABILITY_MAX_BARS_ENV, DEFAULT_AVAILABILITY_MAX_BARS)
+    if len(industries) > max_bars:
+        rest = values[max_bars:]
+        summary = [(label, color, int((rest == value).sum())) for label, color, value in (
+            ("available", '#22C55E', 1), ("not available", '#CBD5E1', 0)
+        )]
+        summary = [item for item in summary if item[2]]
+        industries = np.append(industries[:max_bars], [f"{n:,} more {label}" for label, _, n in summary]).astype(object)
+        values = np.append(values[:max_bars], np.ones(len(summary), dtype=np.int64))
+        colors = np.append(colors[:max_bars], [color for _, color, _ in summary]).astype(object)
+        text = np.append(text[:max_bars], [f"{n:,} industries" for _, _, n in summary]).astype(object)
+        hovertext = np.append(hovertext[:max_bars], [f"{n:,} more industries {label}" for label, _, n in summary]).astype(object)
+
+    import plotly.graph_objects as go
+    fig = go.Figure()
+
+    # Add bars
+    fig.add_trace(go.Bar(
+        y=industries,
+        x=values,
+        orientation='h',
+        marker=dict(
+            color=colors,
+            line=dict(color='rgba(0,0,0,0)', width=1)
+        ),
+        hoverinfo='text',
+        hovertext=hovertext,
+        textposition='auto',
+        text=text
+    ))
+
+    fig.update_layout(
+        title=f"{selected_solution} Industry Availability",
+        xaxis=dict(
+            showgrid=False,
+            showticklabels=False,
+            range=[0, 1]
+        ),
+        margin=dict(l=20, r=20, t=40, b=20),
+        height=400
+    )
+    return set_light_theme(fig)
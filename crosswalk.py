@@ -0,0 +1,167 @@
+import re
+import unicodedata
+
+import numpy as np
+import streamlit as st
+
+import data_source
+from matrix import PortfolioMatrix, get_matrix
+from matrix_table import get_services_table
+
+# Canonical keys of solutions that are named differently in the services sheet,
+# mapped to the key of the same solution in the portfolio matrix
+SOLUTION_KEY_ALIASES = {
+    "customer reviews summariser": "review summariser",
+}
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def display_label(name):
+    """A label as shown: Unicode-normalized, trimmed and single-spaced."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", str(name))).strip()
+
+
+def label_key(name):
+    """Key under which differently written labels are the same: the case-folded display label."""
+    return display_label(name).casefold()
+
+
+def solution_key(name):
+    """Canonical key of a solution name; label_key() plus the known renames."""
+    key = label_key(name)
+    return SOLUTION_KEY_ALIASES.get(key, key)
+
+
+class SolutionKeys:
+    """Row positions of the portfolio matrix by canonical solution key.
+
+    A key that appears on several rows resolves to the first of them.
+    """
+
+    def __init__(self, solutions):
+        self.keys = [solution_key(name) for name in solutions]
+        self.positions = {}
+        for position, key in enumerate(self.keys):
+            self.positions.setdefault(key, position)
+
+    def lookup(self, names):
+        """Matrix row of each name, or -1 where the catalogue has no such solution."""
+        return np.array([self.positions.get(solution_key(name), -1) for name in names], dtype=np.int64)
+
+
+class CsrMatrix:
+    """Minimal compressed sparse row matrix of counts.
+
+    Row r holds the column positions ``indices[indptr[r]:indptr[r + 1]]`` in
+    ascending order, with their values in ``data``.
+    """
+
+    def __init__(self, indptr, indices, data, shape):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.shape = shape
+
+    @classmethod
+    def from_dense(cls, mask):
+        mask = np.asarray(mask, dtype=bool)
+        rows, columns = np.nonzero(mask)
+        indptr = np.zeros(mask.shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=mask.shape[0]), out=indptr[1:])
+        return cls(indptr, columns.astype(np.int64), np.ones(len(columns), dtype=np.int64), mask.shape)
+
+    @classmethod
+    def from_coordinates(cls, rows, columns, data, shape):
+        """CSR from (row, column, value) triplets with no duplicate coordinates."""
+        order = np.lexsort((columns, rows))
+        indptr = np.zeros(shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=shape[0]), out=indptr[1:])
+        return cls(indptr, columns[order], data[order], shape)
+
+    @property
+    def nnz(self):
+        return len(self.indices)
+
+    def _row_ids(self):
+        return np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    def row(self, r):
+        """(column positions, values) of row ``r``."""
+        start, stop = self.indptr[r], self.indptr[r + 1]
+        return self.indices[start:stop], self.data[start:stop]
+
+    def transpose(self):
+        return CsrMatrix.from_coordinates(self.indices, self._row_ids(), self.data, self.shape[::-1])
+
+    def matmul(self, other):
+        """Sparse product ``self @ other``.
+
+        Each stored entry (r, k) of self expands row k of ``other``; products
+        landing on the same (r, c) are summed. Only stored entries are touched.
+        """
+        rows, ks, values = self._row_ids(), self.indices, self.data
+        lengths = other.indptr[ks + 1] - other.indptr[ks]
+        # Positions in other.indices of every expanded entry, one ragged range per (r, k)
+        starts = np.repeat(other.indptr[ks] - np.cumsum(lengths) + lengths, lengths)
+        gathered = starts + np.arange(lengths.sum())
+        out_rows = np.repeat(rows, lengths)
+        out_columns = other.indices[gathered]
+        products = np.repeat(values, lengths) * other.data[gathered]
+        keys, inverse = np.unique(out_rows * other.shape[1] + out_columns, return_inverse=True)
+        sums = np.bincount(inverse, weights=products, minlength=len(keys)).astype(np.int64)
+        return CsrMatrix.from_coordinates(keys // other.shape[1], keys % other.shape[1], sums, (self.shape[0], other.shape[1]))
+
+
+class Crosswalk:
+    """Which service lines reach which industries, and through which solutions.
+
+    ``reach`` is the sparse product of the service line x solution and the
+    solution x industry matrices: entry (s, i) counts the solutions that serve
+    service line s and are available in industry i. It is kept transposed as
+    well so one industry's service lines are a single row lookup. Solutions of
+    the services sheet that are not in the catalogue are listed in ``unmatched``.
+    """
+
+    def __init__(self, matrix, services):
+        positions = SolutionKeys(matrix.solutions).lookup(services.index)
+        self.unmatched = services.index[positions < 0].tolist()
+        # Only solutions present in both sources take part, in a compact column space
+        self.solution_rows, compact = np.unique(positions[positions >= 0], return_inverse=True)
+        service_by_solution = np.zeros((services.shape[1], len(self.solution_rows)), dtype=bool)
+        for column, values in zip(compact, services.to_numpy()[positions >= 0]):
+            service_by_solution[:, column] |= values
+
+        self.service_lines = services.columns.tolist()
+        self.industries = list(matrix.industries)
+        self.industry_index = matrix.industry_index
+        self.solution_names = matrix.solutions[self.solution_rows]
+        self.solutions_by_service = CsrMatrix.from_dense(service_by_solution)
+        self.industries_by_solution = CsrMatrix.from_dense(matrix.values[self.solution_rows])
+        self.solutions_by_industry = self.industries_by_solution.transpose()
+        self.reach = self.solutions_by_service.matmul(self.industries_by_solution)
+        self.reach_by_industry = self.reach.transpose()
+
+    def service_lines_for(self, industry):
+        """(service line names, solution counts) of the service lines reaching ``industry``."""
+        services, counts = self.reach_by_industry.row(self.industry_index[industry])
+        return [self.service_lines[s] for s in services], counts
+
+    def solutions_between(self, service_line, industry):
+        """Names of the solutions linking ``service_line`` to ``industry``."""
+        via_service = self.solutions_by_service.row(self.service_lines.index(service_line))[0]
+        via_industry = self.solutions_by_industry.row(self.industry_index[industry])[0]
+        return self.solution_names[np.intersect1d(via_service, via_industry, assume_unique=True)].tolist()
+
+
+@st.cache_resource(show_spinner=False, max_entries=4, hash_funcs={PortfolioMatrix: lambda m: m.cache_key})
+def _build_crosswalk(matrix, matrix_version, services_version):
+    # Keyed on both versions, so a cell edit or a new services sheet builds a fresh crosswalk
+    with matrix.edit_lock:
+        return Crosswalk(matrix, get_services_table().frame)
+
+
+def get_crosswalk(matrix=None):
+    """The service line x industry crosswalk for the current data versions."""
+    matrix = matrix if matrix is not None else get_matrix()
+    return _build_crosswalk(matrix, matrix.version, data_source.services_version())
@@ -0,0 +1,246 @@
+import hashlib
+import os
+import sqlite3
+
+import pandas as pd
+import streamlit as st
+
+# Where the dashboard reads its matrices from. Each variable holds a path to a
+# .csv, .parquet or SQLite file; SQLite sources name their table after "::",
+# e.g. "portfolio.db::solutions". When unset, the built-in sample data is used.
+SOLUTIONS_SOURCE_ENV = "PORTFOLIO_SOLUTIONS_SOURCE"
+SERVICES_SOURCE_ENV = "PORTFOLIO_SERVICES_SOURCE"
+
+# "mtime" (default) versions a file by modification time and size, "content"
+# by a hash of its bytes so that touching a file does not force a re-parse.
+FINGERPRINT_ENV = "PORTFOLIO_FINGERPRINT"
+
+SOLUTION_COLUMN = "AI Solution"
+SAMPLE_VERSION = "sample"
+
+# Sample Data (replace with actual data from your table)
+SAMPLE_SOLUTIONS = {
+    "AI Solution": [
+        "IoT", "Blockchain powered AI systems", "Hyperpersonalisation", "Recommendation engine", "Chatbot",
+        "Social media manager", "AI adverts", "Ticket handling", "Review summariser", "Smart data cleaning",
+        "AI powered SEO engine", "AI agent copy writer", "Analytics dashboard", "Custom AI/ML solutions",
+        "Business analytics and optimisation"
+    ],
+    "Ecommerce": ["✔", "", "✔", "✔", "✔", "✔", "✔", "", "✔", "", "✔", "", "", "", "✔"],
+    "Gcloud": ["", "✔", "", "✔", "✔", "", "", "", "", "", "", "", "", "✔", ""],
+    "HR Tech Solutions": ["", "", "", "", "", "", "", "", "", "", "", "", "", "✔", ""],
+    "Managed IT Services": ["", "", "", "", "", "", "", "", "", "", "", "", "", "✔", ""],
+    "Modern Tech Support": ["✔", "", "", "", "", "", "", "✔", "", "", "", "", "", "✔", ""],
+    "Govt Solutions": ["", "", "", "", "", "", "", "✔", "", "", "", "", "", "✔", ""],
+    "Telecommunications": ["", "", "", "", "", "", "", "✔", "", "", "", "", "", "✔", ""],
+    "Data Productization": ["", "", "", "", "", "", "", "", "", "", "", "", "✔", "", ""],
+    "SAP": ["", "", "", "", "", "", "", "", "", "", "", "", "", "", ""],
+    "Salesforce": ["", "", "", "", "", "", "", "", "", "", "", "", "", "", ""],
+    "Adobe": ["", "", "", "", "", "", "", "", "", "", "", "", "", "", ""],
+    "Blockchain": ["", "✔", "", "", "", "", "", "", "", "", "", "", "", "✔", "✔"]
+}
+
+# Sample Data (Modify as needed)
+SAMPLE_SERVICES = {
+    "Industry": [
+        "Hyperpersonalisation", "Recommendation Engine", "Chatbot", "Social Media Manager",
+        "AI Adverts", "Ticket Handling", "Customer Reviews Summariser", "AI Powered SEO Engine",
+        "AI Agent Copy Writer", "Analytics Dashboard", "Custom AI/ML Solutions",
+        "Business Analytics and Optimisation", "Business VoIP", "Live Chat",
+        "Multi Channel Service", "Reviews Management"
+    ],
+    "Content Marketing": ["✅", "", "", "✅", "✅", "", "", "", "✅", "", "✅", "", "", "", "", ""],
+    "Digital Advertising": ["✅", "✅", "✅", "✅", "✅", "", "", "", "✅", "", "✅", "✅", "", "", "", "✅"],
+    "Ecommerce": ["✅", "✅", "✅", "✅", "✅", "✅", "✅", "", "✅", "✅", "✅", "✅", "✅", "", "✅", "✅"],
+    "SEO Services": ["✅", "", "", "", "", "", "", "✅", "", "", "", "", "", "", "", ""],
+    "Shopify Ecommerce": ["✅", "✅", "✅", "", "", "✅", "✅", "", "", "✅", "", "✅", "✅", "", "✅", "✅"],
+    "Social Media": ["✅", "", "✅", "✅", "✅", "✅", "", "✅", "✅", "", "", "", "", "✅", "✅", "✅"],
+    "UX Website Design": ["", "", "✅", "", "", "", "", "✅", "", "", "✅", "✅", "", "", "", ""],
+    "Website Assessment": ["", "", "", "", "", "", "", "✅", "", "✅", "✅", "✅", "", "", "", "✅"]
+}
+
+# Short descriptions shown in the Deep Dive tab and searched by the solution picker
+SOLUTION_DESCRIPTIONS = {
+    "Chatbot": "AI-powered conversation agents that handle customer inquiries and support",
+    "IoT": "Internet of Things solutions with AI-powered analytics and decision making",
+    "Blockchain powered AI systems": "Secure, decentralized AI systems built on blockchain technology",
+    "Hyperpersonalisation": "Tailored customer experiences based on AI-driven insights",
+    "Recommendation engine": "Intelligent systems that suggest products or content based on user behavior",
+    "Social media manager": "AI tools for content scheduling, analysis, and engagement optimization",
+    "AI adverts": "Automated advertisement creation and optimization for better conversion",
+    "Ticket handling": "Automated support ticket routing, prioritization, and resolution",
+    "Review summariser": "AI that extracts insights from customer reviews and feedback",
+    "Smart data cleaning": "Automated data preparation and cleansing for analytics",
+    "AI powered SEO engine": "Search optimization tools using natural language processing",
+    "AI agent copy writer": "Content creation tools for marketing and communications",
+    "Analytics dashboard": "Customizable data visualization and business intelligence",
+    "Custom AI/ML solutions": "Bespoke machine learning applications for specific business needs",
+    "Business analytics and optimisation": "End-to-end business performance analysis and enhancement"
+}
+
+
+def parse_source(spec):
+    """Split a source spec into (path, table); table is None for file formats."""
+    path, _, table = spec.partition("::")
+    return path, table or None
+
+
+def source_kind(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return "csv"
+    if ext in (".parquet", ".pq"):
+        return "parquet"
+    if ext in (".db", ".sqlite", ".sqlite3"):
+        return "sqlite"
+    raise ValueError(f"Unsupported data source '{path}': expected .csv, .parquet or SQLite")
+
+
+@st.cache_data(show_spinner=False)
+def _content_hash(path, mtime_ns, size):
+    # Keyed on (mtime, size) so a file is only re-hashed after it changes on disk
+    digest = hashlib.sha1()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_version(spec):
+    """Cheap fingerprint of a source, used as the cache key for everything parsed from it."""
+    if spec is None:
+        return SAMPLE_VERSION
+    path, _ = parse_source(spec)
+    stat = os.stat(path)
+    if os.environ.get(FINGERPRINT_ENV, "mtime") == "content":
+        return _content_hash(path, stat.st_mtime_ns, stat.st_size)
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+@st.cache_data(show_spinner=False)
+def _read_columns(spec, version):
+    path, table = parse_source(spec)
+    kind = source_kind(path)
+    if kind == "csv":
+        return list(pd.read_csv(path, nrows=0).columns)
+    if kind == "parquet":
+        import pyarrow.parquet as pq
+        return list(pq.read_schema(path).names)
+    with sqlite3.connect(f"file:{path}?mode=ro", uri=True) as conn:
+        return [row[1] for row in conn.execute(f"PRAGMA table_info({_quote(table)})")]
+
+
+def _read_frame(spec, columns, label):
+    # Not cached: the parsed string frame is several times the size of the
+    # matrices built from it, which are cached per version instead
+    path, table = parse_source(spec)
+    kind = source_kind(path)
+    usecols = list(columns) if columns is not None else None
+    if kind == "csv":
+        frame = pd.read_csv(path, usecols=usecols, dtype=str, keep_default_na=False)
+    elif kind == "parquet":
+        frame = pd.read_parquet(path, columns=usecols)
+    else:
+        select = ", ".join(_quote(col) for col in usecols) if usecols else "*"
+        with sqlite3.connect(f"file:{path}?mode=ro", uri=True) as conn:
+            frame = pd.read_sql_query(f"SELECT {select} FROM {_quote(table)}", conn)
+    if usecols is not None:
+        frame = frame[usecols]
+    if label is not None and frame.columns[0] != label:
+        frame = frame.rename(columns={frame.columns[0]: label})
+    return frame.fillna("").reset_index(drop=True)
+
+
+def _columns(env_var, sample):
+    spec = os.environ.get(env_var)
+    if spec is None:
+        return list(sample)
+    return _read_columns(spec, source_version(spec))
+
+
+def _frame(env_var, columns, label=None):
+    spec = os.environ.get(env_var)
+    if spec is None:
+        frame = _sample_frame(env_var)
+        return frame if columns is None else frame[list(columns)]
+    return _read_frame(spec, None if columns is None else tuple(columns), label)
+
+
+@st.cache_resource(show_spinner=False)
+def _sample_frame(env_var):
+    sample = SAMPLE_SOLUTIONS if env_var == SOLUTIONS_SOURCE_ENV else SAMPLE_SERVICES
+    return pd.DataFrame(sample)
+
+
+def solutions_version():
+    return source_version(os.environ.get(SOLUTIONS_SOURCE_ENV))
+
+
+def services_version():
+    return source_version(os.environ.get(SERVICES_SOURCE_ENV))
+
+
+def load_industries():
+    """Industry names only (header of the solution matrix), without parsing any rows."""
+    return _columns(SOLUTIONS_SOURCE_ENV, SAMPLE_SOLUTIONS)[1:]
+
+
+def load_solutions(industries=None):
+    """The solution x industry matrix, optionally projected to a subset of industries.
+
+    The first column of the source is always exposed as "AI Solution". Sources are
+    parsed on every call, so callers cache what they build from the frame per data
+    version; the built-in sample frame is shared and must not be modified in place.
+    """
+    columns = None
+    if industries is not None:
+        columns = _columns(SOLUTIONS_SOURCE_ENV, SAMPLE_SOLUTIONS)[:1] + list(industries)
+    return _frame(SOLUTIONS_SOURCE_ENV, columns, SOLUTION_COLUMN)
+
+
+def write_solutions(frame, spec=None):
+    """Atomically replace the configured solutions source (or ``spec``) with ``frame``.
+
+    File sources are written to a temporary file beside the original and moved
+    into place, so readers never see a half-written file. SQLite tables are
+    written under a temporary name and swapped in with one transaction.
+    """
+    spec = spec or os.environ.get(SOLUTIONS_SOURCE_ENV)
+    if spec is None:
+        raise ValueError("The built-in sample data cannot be written; set " + SOLUTIONS_SOURCE_ENV)
+    path, table = parse_source(spec)
+    kind = source_kind(path)
+    if kind == "sqlite":
+        tmp_table = f"{table}.tmp-{os.getpid()}"
+        conn = sqlite3.connect(path)
+        try:
+            # to_sql commits as it goes, so only the finished copy is swapped in
+            frame.to_sql(tmp_table, conn, if_exists="replace", index=False)
+            conn.isolation_level = None
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(f"DROP TABLE IF EXISTS {_quote(table)}")
+                conn.execute(f"ALTER TABLE {_quote(tmp_table)} RENAME TO {_quote(table)}")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                conn.execute(f"DROP TABLE IF EXISTS {_quote(tmp_table)}")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        return
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    if kind == "csv":
+        frame.to_csv(tmp_path, index=False)
+    else:
+        frame.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def load_services():
+    """The solution x service line matrix shown in the Industry Analysis tab."""
+    return _frame(SERVICES_SOURCE_ENV, None)
@@ -0,0 +1,31 @@
+import streamlit as st
+
+_SESSION_KEY = "_derived_state"
+
+
+class DerivedState:
+    """Per-session memo of values derived from widget inputs.
+
+    Each node is identified by name and remembers the inputs it was last computed
+    from. A node recomputes only when its own inputs change; nodes depend on each
+    other by including their upstream inputs (or the data version) in their own.
+    Values are shared references to cached data, so they must not be modified.
+    """
+
+    def __init__(self):
+        self._nodes = {}
+
+    def value(self, name, inputs, compute):
+        node = self._nodes.get(name)
+        if node is not None and node[0] == inputs:
+            return node[1]
+        value = compute()
+        self._nodes[name] = (inputs, value)
+        return value
+
+
+def get_derived_state():
+    state = st.session_state.get(_SESSION_KEY)
+    if state is None:
+        state = st.session_state[_SESSION_KEY] = DerivedState()
+    return state
@@ -0,0 +1,234 @@
+import json
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import data_source
+from matrix import AVAILABLE, alias_version, get_matrix
+
+# Cell edits made in the dashboard are appended to a JSON-lines log instead of
+# rewriting the dataset. By default the log sits beside the solutions source
+# ("<source>.edits.jsonl"), or in the working directory for the sample data.
+EDIT_LOG_ENV = "PORTFOLIO_EDIT_LOG"
+DEFAULT_EDIT_LOG = "portfolio_edits.jsonl"
+
+# Seconds between background compactions of the log into the solutions source;
+# 0 disables them. Run compaction in one process only when several share a log.
+COMPACT_INTERVAL_ENV = "PORTFOLIO_COMPACT_INTERVAL"
+DEFAULT_COMPACT_INTERVAL = 60
+
+# The log is renamed to this while it is folded into the source, so appends made
+# meanwhile start a fresh log and nothing is lost if compaction is interrupted
+COMPACTING_SUFFIX = ".compacting"
+
+logger = logging.getLogger(__name__)
+
+
+def log_path():
+    path = os.environ.get(EDIT_LOG_ENV)
+    if path:
+        return path
+    spec = os.environ.get(data_source.SOLUTIONS_SOURCE_ENV)
+    if spec is None:
+        return DEFAULT_EDIT_LOG
+    return data_source.parse_source(spec)[0] + ".edits.jsonl"
+
+
+def _inode(path):
+    try:
+        return os.stat(path).st_ino
+    except FileNotFoundError:
+        return None
+
+
+def read_entries(path, offset=0):
+    """Complete log entries after byte ``offset``, and the offset just past them.
+
+    A trailing line still being written by another process is left for the next read.
+    """
+    try:
+        with open(path, "rb") as handle:
+            handle.seek(offset)
+            data = handle.read()
+    except FileNotFoundError:
+        return [], offset
+    end = data.rfind(b"\n") + 1
+    entries = [json.loads(line) for line in data[:end].splitlines() if line.strip()]
+    return entries, offset + end
+
+
+@st.cache_resource(show_spinner=False)
+def _append_lock():
+    return threading.Lock()
+
+
+def append_entries(path, changes, session_id=None):
+    """Append one entry per (solution, industry, value) change, durably, in a single write."""
+    ts = time.time()
+    payload = "".join(
+        json.dumps({"ts": ts, "session": session_id, "solution": solution, "industry": industry, "value": value},
+                   ensure_ascii=False) + "\n"
+        for solution, industry, value in changes
+    )
+    with _append_lock():
+        with open(path, "a", encoding="utf-8") as handle:
+            handle.write(payload)
+            handle.flush()
+            os.fsync(handle.fileno())
+
+
+class LogReader:
+    """Position in the edit log up to which one live matrix has been brought.
+
+    Only the bytes appended since the last read are parsed. When the log is
+    rotated for compaction, the rest of the rotated file is read before
+    starting again at the top of the new log.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.inode = None
+        self.offset = 0
+        self.started = False
+        self.lock = threading.Lock()
+
+    def read_new(self):
+        entries = []
+        rotated = self.path + COMPACTING_SUFFIX
+        if not self.started:
+            # A leftover rotated log holds edits older than anything in the live one
+            entries += read_entries(rotated)[0]
+            self.started = True
+        inode = _inode(self.path)
+        if self.inode is not None and inode != self.inode:
+            if _inode(rotated) == self.inode:
+                entries += read_entries(rotated, self.offset)[0]
+            self.offset = 0
+        self.inode = inode
+        if inode is not None:
+            new_entries, self.offset = read_entries(self.path, self.offset)
+            entries += new_entries
+        return entries
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _reader(cache_key, path):
+    return LogReader(path)
+
+
+def _apply(matrix, entry):
+    # Entries naming solutions or industries no longer in the catalogue are skipped
+    if entry["solution"] in matrix.solution_index and entry["industry"] in matrix.industry_index:
+        matrix.set_cell(entry["solution"], entry["industry"], entry["value"])
+
+
+def sync(matrix):
+    """Apply the edits appended since this matrix was last synced, by any session or process.
+
+    The matrix, and through it the bitset index and aggregates, is updated cell
+    by cell; nothing is rebuilt. Returns the number of entries applied.
+    """
+    reader = _reader(matrix.cache_key, log_path())
+    with reader.lock:
+        entries = reader.read_new()
+        for entry in entries:
+            _apply(matrix, entry)
+    return len(entries)
+
+
+def record_edits(matrix, changes):
+    """Log ``changes`` and apply them to the live matrix; returns how many cells changed.
+
+    ``changes`` holds (solution, industry, value) triples; ones that match the
+    current value are dropped before anything is written.
+    """
+    changes = [
+        (solution, industry, bool(value)) for solution, industry, value in changes
+        if matrix.values[matrix.solution_index[solution], matrix.industry_index[industry]] != bool(value)
+    ]
+    if not changes:
+        return 0
+    ctx = get_script_run_ctx(suppress_warning=True)
+    append_entries(log_path(), changes, ctx.session_id if ctx is not None else None)
+    sync(matrix)
+    return len(changes)
+
+
+@st.cache_resource(show_spinner=False)
+def _compaction_lock():
+    return threading.Lock()
+
+
+def compact(matrix):
+    """Fold the edit log into the solutions source; returns the number of entries folded.
+
+    The rewritten source is registered as an alias of the live matrix, which
+    already holds these edits, so it is not parsed again in this process. The
+    sample data cannot be rewritten, so its log is kept as the record of edits.
+    """
+    if os.environ.get(data_source.SOLUTIONS_SOURCE_ENV) is None:
+        return 0
+    path = log_path()
+    rotated = path + COMPACTING_SUFFIX
+    with _compaction_lock():
+        sync(matrix)
+        if not os.path.exists(rotated):
+            if not os.path.exists(path) or os.path.getsize(path) == 0:
+                return 0
+            os.replace(path, rotated)
+        entries = read_entries(rotated)[0]
+        # Entries appended by other processes since the sync above are in the
+        # rotated log too; the live matrix must hold all of them before it is
+        # aliased to the rewritten source
+        sync(matrix)
+
+        frame = data_source.load_solutions()
+        solutions = frame.iloc[:, 0]
+        raw = frame.iloc[:, 1:].to_numpy()
+        values = (raw == AVAILABLE) | (raw == True)
+        rows = {name: i for i, name in enumerate(solutions)}
+        columns = {name: j for j, name in enumerate(frame.columns[1:])}
+        for entry in entries:
+            if entry["solution"] in rows and entry["industry"] in columns:
+                values[rows[entry["solution"]], columns[entry["industry"]]] = entry["value"]
+
+        # Keep the source's schema: boolean or 0/1 columns stay numeric, markers stay text
+        dtypes = frame.dtypes.iloc[1:]
+        if len(dtypes) and all(dtype != object for dtype in dtypes):
+            snapshot = pd.DataFrame(values, columns=frame.columns[1:]).astype(dtypes.to_dict())
+        else:
+            snapshot = pd.DataFrame(np.where(values, AVAILABLE, ""), columns=frame.columns[1:])
+        snapshot.insert(0, frame.columns[0], solutions.to_numpy())
+        data_source.write_solutions(snapshot)
+        alias_version(data_source.solutions_version(), matrix.cache_key)
+        os.remove(rotated)
+    return len(entries)
+
+
+def _compact_forever(interval):
+    while True:
+        time.sleep(interval)
+        try:
+            compact(get_matrix())
+        except Exception:
+            logger.exception("Edit log compaction failed")
+
+
+@st.cache_resource(show_spinner=False)
+def start_compactor(interval):
+    """Compact the edit log every ``interval`` seconds from a daemon thread, once per process."""
+    thread = threading.Thread(target=_compact_forever, args=(interval,), name="edit-log-compactor", daemon=True)
+    thread.start()
+    return thread
+
+
+def maybe_start_compactor():
+    interval = float(os.environ.get(COMPACT_INTERVAL_ENV, DEFAULT_COMPACT_INTERVAL))
+    if interval > 0 and os.environ.get(data_source.SOLUTIONS_SOURCE_ENV) is not None:
+        start_compactor(interval)
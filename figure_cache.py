@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Bounds for the shared figure cache; both can be overridden from the environment
+MAX_ENTRIES_ENV = "FIGURE_CACHE_MAX_ENTRIES"
+MAX_BYTES_ENV = "FIGURE_CACHE_MAX_BYTES"
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def figure_key(**params):
+    """Canonical hash of the view parameters a figure was built from.
+
+    Parameters are serialized with sorted keys, so the same view always maps
+    to the same key regardless of argument order.
+    """
+    payload = json.dumps(params, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _nbytes(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(_nbytes(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_nbytes(item) for item in value)
+    if isinstance(value, str):
+        return len(value)
+    return 8
+
+
+def figure_size(fig):
+    """Estimated bytes held by a figure's traces, from their array sizes.
+
+    Cheap enough for every cache miss, unlike serializing the figure; layout
+    is left out as it is small and does not grow with the data.
+    """
+    if fig is None:
+        return 0
+    if isinstance(fig, pd.DataFrame):
+        # Pre-rendered table windows share the cache with figures
+        return int(fig.memory_usage(index=True).sum())
+    return sum(_nbytes(trace.to_plotly_json()) for trace in fig.data)
+
+
+class FigureCache:
+    """Thread-safe LRU cache of built figures bounded by entry count and estimated size.
+
+    Cached figures are shared between sessions and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        # Built outside the lock so a slow figure does not block other sessions
+        fig = build()
+        size = figure_size(fig)
+        if size > self.max_bytes:
+            return fig
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (fig, size)
+                self.total_bytes += size
+                self._evict()
+        return fig
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes):
+            _, (_, size) = self._entries.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+@st.cache_resource(show_spinner=False)
+def get_figure_cache():
+    """The process-wide figure cache shared by every session."""
+    return FigureCache(
+        max_entries=int(os.environ.get(MAX_ENTRIES_ENV, DEFAULT_MAX_ENTRIES)),
+        max_bytes=int(os.environ.get(MAX_BYTES_ENV, DEFAULT_MAX_BYTES)),
+    )
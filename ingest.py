@@ -0,0 +1,435 @@
+"""Merge team-owned solution matrices into the canonical solutions source.
+
+Reads every source in a thread pool, streaming rows in batches, validates the
+availability markers, canonicalizes solution and industry labels and writes
+the merged matrix to the source the dashboard reads. A solution is available
+in an industry if any source marks it so.
+
+    python ingest.py teams/*.csv exports/ --output portfolio.parquet
+    python ingest.py teams/ --workers 8 --report ingest_report.json
+
+Sources are .csv, .parquet, .xlsx ("book.xlsx" or "book.xlsx::Sheet") or
+SQLite ("file.db::table") files, or directories of them. The first column holds
+solution names and every other column is an industry. Each parsed source is
+cached beside the output under its fingerprint, so a rerun only parses the
+sources that changed and leaves the output untouched when none did.
+
+Cell edits compacted into the output are replaced by the next ingestion, so
+lasting changes belong in the team sources.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import data_source
+from crosswalk import display_label, label_key, solution_key
+from matrix import AVAILABLE
+
+# Availability markers, compared after trimming and case folding
+TRUE_MARKERS = {"✔", "✅", "✓", "☑", "x", "true", "yes", "y", "1"}
+FALSE_MARKERS = {"", "false", "no", "n", "0", "-", "none", "nan"}
+
+BATCH_ROWS = 5000
+# Rejected rows listed per source; all of them are counted
+MAX_REPORTED_REJECTS = 20
+MANIFEST = "manifest.json"
+SPREADSHEET_EXTENSIONS = (".xlsx", ".xlsm")
+# Picked up from directories; SQLite sources name a table, so they are listed explicitly
+FILE_EXTENSIONS = (".csv", ".parquet", ".pq") + SPREADSHEET_EXTENSIONS
+
+
+def marker_value(cell):
+    """True or False for a recognized availability marker, None for anything else."""
+    if cell is None or isinstance(cell, bool):
+        return bool(cell)
+    if isinstance(cell, (int, float, np.integer, np.floating)):
+        if cell != cell:  # NaN, an empty cell in most readers
+            return False
+        return {1: True, 0: False}.get(cell)
+    # U+FE0F asks for emoji presentation ("✔️"); it does not change the marker
+    text = str(cell).replace("\ufe0f", "").strip().casefold()
+    if text in TRUE_MARKERS:
+        return True
+    if text in FALSE_MARKERS:
+        return False
+    return None
+
+
+def _kind(path):
+    if os.path.splitext(path)[1].lower() in SPREADSHEET_EXTENSIONS:
+        return "xlsx"
+    return data_source.source_kind(path)
+
+
+def _batched(rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == BATCH_ROWS:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def read_rows(spec):
+    """Header of a source, then its data rows in batches, without loading the whole file."""
+    path, table = data_source.parse_source(spec)
+    kind = _kind(path)
+    if kind == "csv":
+        with open(path, newline="", encoding="utf-8-sig") as handle:
+            reader = csv.reader(handle)
+            yield next(reader, None)
+            yield from _batched(reader)
+    elif kind == "parquet":
+        import pyarrow.parquet as pq
+        source = pq.ParquetFile(path)
+        yield source.schema_arrow.names
+        for batch in source.iter_batches(batch_size=BATCH_ROWS):
+            yield list(zip(*(column.to_pylist() for column in batch.columns)))
+    elif kind == "xlsx":
+        try:
+            import openpyxl
+        except ImportError:
+            raise ValueError("reading spreadsheets requires openpyxl (pip install openpyxl)") from None
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = (workbook[table] if table else workbook.active).iter_rows(values_only=True)
+            header = next(rows, None)
+            yield None if header is None else ["" if name is None else name for name in header]
+            yield from _batched(rows)
+        finally:
+            workbook.close()
+    else:
+        if table is None:
+            raise ValueError(f"SQLite sources name their table, e.g. {path}::solutions")
+        with sqlite3.connect(f"file:{path}?mode=ro", uri=True) as conn:
+            cursor = conn.execute(f"SELECT * FROM {data_source._quote(table)}")
+            yield [column[0] for column in cursor.description]
+            while True:
+                batch = cursor.fetchmany(BATCH_ROWS)
+                if not batch:
+                    break
+                yield batch
+
+
+def _merge_duplicates(keys, values, axis):
+    """Collapse entries of ``values`` along ``axis`` that share a key, OR-ing them.
+
+    Returns the positions of the first entry of each key, in order of first
+    appearance, and the merged values.
+    """
+    unique, first, inverse = np.unique(np.asarray(keys, dtype=str), return_index=True, return_inverse=True)
+    if len(unique) == len(keys):
+        return np.arange(len(keys)), values
+    order = np.argsort(inverse, kind="stable")
+    starts = np.flatnonzero(np.r_[True, np.diff(inverse[order]) != 0])
+    merged = np.logical_or.reduceat(np.take(values, order, axis=axis), starts, axis=axis)
+    by_appearance = np.argsort(first, kind="stable")
+    return np.sort(first), np.take(merged, by_appearance, axis=axis)
+
+
+class ParsedSource:
+    """One source reduced to canonical labels and a deduplicated boolean block."""
+
+    def __init__(self, spec, fingerprint):
+        self.spec = spec
+        self.fingerprint = fingerprint
+        self.names = []
+        self.industries = []
+        self.values = np.zeros((0, 0), dtype=bool)
+        self.rows = 0
+        self.rejected = 0
+        self.rejects = []
+        self.parse_ms = 0.0
+        self.error = None
+        self.cached = False
+
+    def reject(self, row, reason):
+        self.rejected += 1
+        if len(self.rejects) < MAX_REPORTED_REJECTS:
+            self.rejects.append({"row": row, "reason": reason})
+
+    def report(self):
+        return {
+            "source": self.spec,
+            "status": "failed" if self.error else "cached" if self.cached else "parsed",
+            "rows": self.rows,
+            "solutions": len(self.names),
+            "industries": len(self.industries),
+            "rejected": self.rejected,
+            "rejects": sorted(self.rejects, key=lambda reject: reject["row"]),
+            "parse_ms": round(self.parse_ms, 3),
+            "error": self.error,
+        }
+
+
+def parse_source(spec, fingerprint):
+    """Stream one source into a ParsedSource; failures are recorded rather than raised."""
+    parsed = ParsedSource(spec, fingerprint)
+    started = time.perf_counter()
+    try:
+        _parse_into(parsed, read_rows(spec))
+    except Exception as exc:
+        parsed.error = f"{type(exc).__name__}: {exc}"
+    parsed.parse_ms = (time.perf_counter() - started) * 1000
+    return parsed
+
+
+def _parse_into(parsed, rows):
+    header = next(rows)
+    if not header or len(header) < 2:
+        raise ValueError("expected a solution column followed by at least one industry column")
+    industries = [display_label(name) for name in header[1:]]
+    if not all(industries):
+        raise ValueError(f"industry column {industries.index('') + 2} has no name")
+    width = len(header)
+
+    names, blocks = [], []
+    for batch in rows:
+        row_numbers, labels, cells = [], [], []
+        for row in batch:
+            parsed.rows += 1
+            if len(row) != width:
+                parsed.reject(parsed.rows, f"expected {width} cells, found {len(row)}")
+                continue
+            label = "" if row[0] is None else display_label(row[0])
+            if not label:
+                parsed.reject(parsed.rows, "missing solution name")
+                continue
+            row_numbers.append(parsed.rows)
+            labels.append(label)
+            cells.append(row[1:])
+        if not cells:
+            continue
+        # Markers are resolved once per distinct value in the batch, not once per cell
+        codes, uniques = pd.factorize(np.array(cells, dtype=object).ravel(), use_na_sentinel=False)
+        resolved = [marker_value(value) for value in uniques]
+        valid = np.array([value is not None for value in resolved], dtype=bool)[codes].reshape(len(cells), -1)
+        values = np.array([bool(value) for value in resolved], dtype=bool)[codes].reshape(len(cells), -1)
+        for i in np.flatnonzero(~valid.all(axis=1)):
+            column = int(np.argmin(valid[i]))
+            parsed.reject(row_numbers[i], f"unrecognized marker {cells[i][column]!r} in column '{industries[column]}'")
+        keep = valid.all(axis=1)
+        names.extend(label for label, ok in zip(labels, keep) if ok)
+        blocks.append(values[keep])
+
+    values = np.concatenate(blocks) if blocks else np.zeros((0, len(industries)), dtype=bool)
+    columns, values = _merge_duplicates([label_key(name) for name in industries], values, axis=1)
+    rows_kept, values = _merge_duplicates([solution_key(name) for name in names], values, axis=0)
+    parsed.industries = [industries[i] for i in columns]
+    parsed.names = [names[i] for i in rows_kept]
+    parsed.values = values
+
+
+def merge(sources):
+    """One matrix from every parsed source, labels in order of first appearance."""
+    solution_rows, industry_columns = {}, {}
+    names, industries = [], []
+    placements = []
+    for source in sources:
+        rows = []
+        for name in source.names:
+            key = solution_key(name)
+            if key not in solution_rows:
+                solution_rows[key] = len(names)
+                names.append(name)
+            rows.append(solution_rows[key])
+        columns = []
+        for name in source.industries:
+            key = label_key(name)
+            if key not in industry_columns:
+                industry_columns[key] = len(industries)
+                industries.append(name)
+            columns.append(industry_columns[key])
+        placements.append((rows, columns))
+
+    values = np.zeros((len(names), len(industries)), dtype=bool)
+    for source, (rows, columns) in zip(sources, placements):
+        # Rows and columns are unique within a source, so the in-place OR never collides
+        values[np.ix_(rows, columns)] |= source.values
+    return names, industries, values
+
+
+def expand_sources(arguments):
+    """Source specs from files, SQLite specs and directories, in argument order without repeats."""
+    specs = []
+    for argument in arguments:
+        if os.path.isdir(argument):
+            specs.extend(
+                os.path.join(argument, name) for name in sorted(os.listdir(argument))
+                if os.path.splitext(name)[1].lower() in FILE_EXTENSIONS
+            )
+        else:
+            specs.append(argument)
+    return list(dict.fromkeys(specs))
+
+
+class SourceCache:
+    """Parsed sources kept beside the output, reused while their fingerprint holds."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        try:
+            with open(os.path.join(directory, MANIFEST), encoding="utf-8") as handle:
+                self.manifest = json.load(handle)
+        except (FileNotFoundError, ValueError):
+            self.manifest = {"sources": {}, "inputs": None}
+
+    def _path(self, spec):
+        return os.path.join(self.directory, hashlib.sha1(spec.encode("utf-8")).hexdigest()[:16] + ".npz")
+
+    def load(self, spec, fingerprint):
+        entry = self.manifest["sources"].get(spec)
+        if entry is None or entry["fingerprint"] != fingerprint:
+            return None
+        try:
+            with np.load(self._path(spec)) as stored:
+                parsed = ParsedSource(spec, fingerprint)
+                parsed.names = stored["names"].tolist()
+                parsed.industries = stored["industries"].tolist()
+                shape = tuple(stored["shape"])
+                parsed.values = np.unpackbits(stored["values"], count=shape[0] * shape[1]).astype(bool).reshape(shape)
+        except (FileNotFoundError, KeyError, ValueError):
+            return None
+        report = entry["report"]
+        parsed.rows, parsed.rejected, parsed.rejects = report["rows"], report["rejected"], report["rejects"]
+        parsed.cached = True
+        return parsed
+
+    def store(self, parsed):
+        path = self._path(parsed.spec)
+        np.savez(
+            f"{path}.tmp.npz",
+            names=np.array(parsed.names, dtype=str),
+            industries=np.array(parsed.industries, dtype=str),
+            shape=np.array(parsed.values.shape),
+            values=np.packbits(parsed.values),
+        )
+        os.replace(f"{path}.tmp.npz", path)
+        self.manifest["sources"][parsed.spec] = {"fingerprint": parsed.fingerprint, "report": parsed.report()}
+
+    def save(self, inputs, written):
+        # Entries of sources that are no longer ingested are dropped with their files
+        for spec in set(self.manifest["sources"]) - set(inputs):
+            del self.manifest["sources"][spec]
+            if os.path.exists(self._path(spec)):
+                os.remove(self._path(spec))
+        # The inputs the output was last written from; a change forces a rewrite
+        if written:
+            self.manifest["inputs"] = inputs
+        tmp_path = os.path.join(self.directory, f"{MANIFEST}.tmp-{os.getpid()}")
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(self.manifest, handle, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, os.path.join(self.directory, MANIFEST))
+
+
+def _fingerprint(spec):
+    try:
+        return data_source.source_version(spec)
+    except OSError:
+        return None
+
+
+def ingest(specs, output, workers=None, force=False):
+    """Parse the changed sources, merge everything and write ``output`` if anything changed.
+
+    Returns (per-source reports, whether the output was written).
+    """
+    cache = SourceCache(f"{data_source.parse_source(output)[0]}.ingest")
+    fingerprints = {spec: _fingerprint(spec) for spec in specs}
+    sources, stale = {}, []
+    for spec in specs:
+        cached = None if force or fingerprints[spec] is None else cache.load(spec, fingerprints[spec])
+        if cached is not None:
+            sources[spec] = cached
+        else:
+            stale.append(spec)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for parsed in pool.map(lambda spec: parse_source(spec, fingerprints[spec]), stale):
+            sources[parsed.spec] = parsed
+            if parsed.error is None and parsed.fingerprint is not None:
+                cache.store(parsed)
+
+    ordered = [sources[spec] for spec in specs]
+    reports = [source.report() for source in ordered]
+    if any(source.error for source in ordered):
+        cache.save(specs, written=False)
+        return reports, False
+    unchanged = not stale and cache.manifest.get("inputs") == specs and os.path.exists(data_source.parse_source(output)[0])
+    if unchanged:
+        return reports, False
+
+    names, industries, values = merge(ordered)
+    if not names:
+        raise ValueError("no valid solution rows in any source")
+    if _kind(data_source.parse_source(output)[0]) == "csv":
+        cells = np.where(values, AVAILABLE, "")
+    else:
+        cells = values
+    frame = pd.DataFrame(cells, columns=industries)
+    frame.insert(0, data_source.SOLUTION_COLUMN, names)
+    data_source.write_solutions(frame, output)
+    cache.save(specs, written=True)
+    return reports, True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sources", nargs="+", help="source files, SQLite specs (file.db::table) or directories")
+    parser.add_argument("--output", default=os.environ.get(data_source.SOLUTIONS_SOURCE_ENV),
+                        help=f"merged solutions source (default: ${data_source.SOLUTIONS_SOURCE_ENV})")
+    parser.add_argument("--workers", type=int, default=None, help="parser threads (default: Python's default)")
+    parser.add_argument("--force", action="store_true", help="parse every source even if it is unchanged")
+    parser.add_argument("--report", help="optional JSON report file")
+    args = parser.parse_args(argv)
+    if not args.output:
+        parser.error(f"--output is required when ${data_source.SOLUTIONS_SOURCE_ENV} is not set")
+
+    specs = expand_sources(args.sources)
+    if not specs:
+        parser.error("no sources found")
+    started = time.perf_counter()
+    reports, written = ingest(specs, args.output, args.workers, args.force)
+
+    width = max(len(report["source"]) for report in reports)
+    print(f"{'source':<{width}}  status  {'rows':>8}  {'rejected':>8}  {'parse ms':>9}")
+    for report in reports:
+        print(
+            f"{report['source']:<{width}}  {report['status']:<6}  {report['rows']:>8}"
+            f"  {report['rejected']:>8}  {report['parse_ms']:>9.1f}"
+        )
+        for reject in report["rejects"]:
+            print(f"    row {reject['row']}: {reject['reason']}")
+        if report["rejected"] > len(report["rejects"]):
+            print(f"    ... {report['rejected'] - len(report['rejects'])} more rejected rows")
+        if report["error"]:
+            print(f"    {report['error']}")
+
+    failed = [report["source"] for report in reports if report["error"]]
+    if failed:
+        print(f"Not written: {len(failed)} source(s) could not be read")
+    elif written:
+        print(f"Wrote {args.output} in {time.perf_counter() - started:.1f}s")
+    else:
+        print(f"{args.output} is up to date")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as handle:
+            json.dump({"output": args.output, "written": written, "sources": reports}, handle, ensure_ascii=False, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
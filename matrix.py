@@ -0,0 +1,156 @@
+import threading
+import weakref
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import data_source
+import shared_matrix
+
+AVAILABLE = "✔"
+
+
+class PortfolioMatrix:
+    """Solution x industry availability as a read-only boolean NumPy matrix.
+
+    Built once per data version and shared by every session and tab. Callers
+    take views or slices of ``values`` and never write to it; the only writes
+    are single-cell edits through set_cell(), which bump ``revision`` and are
+    forwarded to every subscribed index so nothing has to be rebuilt.
+    """
+
+    def __init__(self, solutions, industries, values, version):
+        self.solutions = np.asarray(solutions, dtype=object)
+        self.industries = list(industries)
+        self.values = np.ascontiguousarray(values, dtype=bool)
+        self.values.flags.writeable = False
+        # Derived caches are keyed on cache_key, which edits never change
+        self.cache_key = version
+        self.revision = 0
+        self.solution_index = {name: i for i, name in enumerate(self.solutions)}
+        self.industry_index = {name: j for j, name in enumerate(self.industries)}
+        self._listeners = []
+        self.edit_lock = threading.RLock()
+
+    @classmethod
+    def from_frame(cls, frame, version):
+        # One vectorized comparison over the whole block instead of a lambda per cell.
+        # Parquet and SQLite sources may store availability as booleans or 0/1.
+        raw = frame.iloc[:, 1:].to_numpy()
+        values = (raw == AVAILABLE) | (raw == True)
+        return cls(frame.iloc[:, 0].to_numpy(), frame.columns[1:], values, version)
+
+    @property
+    def version(self):
+        """Data version plus edit revision; changes with every applied edit."""
+        if self.revision == 0:
+            return self.cache_key
+        return f"{self.cache_key}+r{self.revision}"
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def subscribe(self, callback):
+        """Call ``callback(row, column, value)`` after each changed cell.
+
+        Bound methods are held weakly, so an evicted index stops receiving updates.
+        """
+        ref = weakref.WeakMethod(callback) if hasattr(callback, "__self__") else (lambda: callback)
+        self._listeners.append(ref)
+
+    def set_cell(self, solution, industry, value):
+        """Set one availability cell in place; returns True if it changed."""
+        i, j = self.solution_index[solution], self.industry_index[industry]
+        value = bool(value)
+        with self.edit_lock:
+            if self.values[i, j] == value:
+                return False
+            self.values.flags.writeable = True
+            self.values[i, j] = value
+            self.values.flags.writeable = False
+            self._listeners = [ref for ref in self._listeners if ref() is not None]
+            for ref in self._listeners:
+                ref()(i, j, value)
+            self.revision += 1
+        return True
+
+    @cached_property
+    def name_rank(self):
+        """Alphabetical rank of every solution, for sorting row subsets by name."""
+        rank = np.empty(len(self.solutions), dtype=np.intp)
+        rank[np.argsort(self.solutions.astype(str), kind="stable")] = np.arange(len(self.solutions))
+        return rank
+
+    def industry_positions(self, industries):
+        return np.fromiter((self.industry_index[name] for name in industries), dtype=np.intp, count=len(industries))
+
+    def select(self, rows=None, industries=None):
+        """Boolean sub-matrix for the given row positions and industry names.
+
+        Returns a view of ``values`` whenever no fancy indexing is needed.
+        """
+        columns = None
+        if industries is not None and list(industries) != self.industries:
+            columns = self.industry_positions(industries)
+        if rows is None:
+            return self.values if columns is None else self.values[:, columns]
+        if columns is None:
+            return self.values[rows]
+        return self.values[np.ix_(rows, columns)]
+
+    def row(self, solution, industries=None):
+        """Availability of one solution across ``industries`` (all industries by default)."""
+        values = self.values[self.solution_index[solution]]
+        if industries is None or list(industries) == self.industries:
+            return values
+        return values[self.industry_positions(industries)]
+
+    def analysis_frame(self, rows=None, industries=None):
+        """0/1 frame in the shape ``transform_data_for_analysis`` used to produce."""
+        industries = self.industries if industries is None else list(industries)
+        block = self.select(rows, industries).view(np.uint8)
+        solutions = self.solutions if rows is None else self.solutions[rows]
+        frame = pd.DataFrame(block, columns=industries)
+        frame.insert(0, data_source.SOLUTION_COLUMN, solutions)
+        return frame
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _build_matrix(version):
+    directory = shared_matrix.shared_dir()
+    if directory is None:
+        return PortfolioMatrix.from_frame(data_source.load_solutions(), version)
+    # One process per host parses the source and publishes it; the rest map it
+    path = shared_matrix.segment_path(directory, version)
+    segment = shared_matrix.attach(path, version)
+    if segment is None:
+        built = PortfolioMatrix.from_frame(data_source.load_solutions(), version)
+        shared_matrix.publish(path, built.solutions, built.industries, built.values, version)
+        segment = shared_matrix.attach(path, version)
+        if segment is None:
+            # Replaced by another process publishing a newer version in the meantime
+            return built
+    return PortfolioMatrix(*segment)
+
+
+@st.cache_resource(show_spinner=False)
+def _version_aliases():
+    return {}
+
+
+def alias_version(version, cache_key):
+    """Serve data ``version`` from the already-built matrix cached under ``cache_key``.
+
+    Used after an edit log is compacted into the source: the live matrix already
+    holds those edits, so the rewritten file does not need to be parsed again.
+    """
+    _version_aliases()[version] = cache_key
+
+
+def get_matrix():
+    """The canonical matrix for the current solutions source version."""
+    version = data_source.solutions_version()
+    return _build_matrix(_version_aliases().get(version, version))
@@ -0,0 +1,79 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import data_source
+
+SERVICE_AVAILABLE = "✅"
+
+# A table in the exact form st.dataframe is given, plus its column_config and height
+RenderedTable = namedtuple("RenderedTable", ["frame", "column_config", "height"])
+
+TABLE_SORT_OPTIONS = [
+    "Catalogue order",
+    "Solution name",
+    "Industries covered (most first)",
+    "Industries covered (fewest first)"
+]
+TABLE_PAGE_SIZES = [25, 50, 100, 250]
+# Widest slice of industry columns serialized at once
+TABLE_MAX_COLUMNS = 25
+
+
+def table_rows(matrix, index, rows, industries, query="", sort_by=TABLE_SORT_OPTIONS[0]):
+    """Row positions to show, after the search filter and sort, computed on the cached matrix."""
+    rows = np.arange(matrix.shape[0]) if rows is None else np.asarray(rows)
+    if query:
+        names = pd.Series(matrix.solutions[rows], dtype=object).astype(str)
+        rows = rows[names.str.contains(query, case=False, regex=False).to_numpy()]
+
+    if sort_by == TABLE_SORT_OPTIONS[0]:
+        return rows
+    if sort_by == TABLE_SORT_OPTIONS[1]:
+        key = matrix.name_rank[rows]
+    else:
+        key = index.coverage_in(industries)[rows]
+        if sort_by == TABLE_SORT_OPTIONS[2]:
+            key = -key
+    return rows[np.argsort(key, kind="stable")]
+
+
+def table_window(matrix, rows, industries, start, page_size, first_column=0, max_columns=TABLE_MAX_COLUMNS):
+    """Boolean frame for one page of rows and one window of industry columns.
+
+    Only this window is ever handed to st.dataframe, so the payload depends on
+    the page size rather than on the size of the catalogue.
+    """
+    page_rows = rows[start:start + page_size]
+    window = list(industries[first_column:first_column + max_columns])
+    values = matrix.values[np.ix_(page_rows, matrix.industry_positions(window))]
+    return pd.DataFrame(
+        values,
+        index=pd.Index(matrix.solutions[page_rows], name=data_source.SOLUTION_COLUMN),
+        columns=window,
+    )
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _services_table(version):
+    services = data_source.load_services()
+    label = services.columns[0]
+    raw = services.iloc[:, 1:].to_numpy()
+    frame = pd.DataFrame(
+        (raw == SERVICE_AVAILABLE) | (raw == True),
+        index=pd.Index(services[label], name=label),
+        columns=services.columns[1:],
+    )
+    # Checkbox cells are centered by the grid itself, so no Styler pass is needed
+    column_config = {
+        col: st.column_config.CheckboxColumn(col, disabled=True) for col in frame.columns
+    }
+    height = (len(frame) + 1) * 35 + 3  # Formula for height
+    return RenderedTable(frame, column_config, height)
+
+
+def get_services_table():
+    """The service line table, prepared once per version of the services source."""
+    return _services_table(data_source.services_version())
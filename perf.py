@@ -0,0 +1,318 @@
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from figure_cache import get_figure_cache
+
+# Timing is off unless DASHBOARD_PERF is set; when off, span() hands back a
+# shared no-op context manager and nothing is recorded
+ENABLED_ENV = "DASHBOARD_PERF"
+LOG_PATH_ENV = "DASHBOARD_PERF_LOG"
+METRICS_PORT_ENV = "DASHBOARD_METRICS_PORT"
+DEFAULT_LOG_PATH = "perf_log.jsonl"
+
+# Widget values attached to every logged rerun
+LOGGED_WIDGET_KEYS = [
+    "selected_industries", "solution_category", "chart_type", "color_theme",
+    "solution_select", "industry_select", "table_search", "table_sort", "table_page", "edit_matrix",
+    "similarity_metric", "solution_select_search", "industry_select_search",
+]
+
+HISTOGRAM_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_NOOP = contextlib.nullcontext()
+_SESSION_KEY = "_perf_recorder"
+
+
+def enabled():
+    return os.environ.get(ENABLED_ENV, "").lower() in ("1", "true", "yes", "on")
+
+
+class Histograms:
+    """Process-wide per-stage latency histograms, rendered in Prometheus text format."""
+
+    def __init__(self, buckets=HISTOGRAM_BUCKETS):
+        self.buckets = buckets
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                entry = self._stages[stage] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    entry["buckets"][i] += 1
+            entry["sum"] += seconds
+            entry["count"] += 1
+
+    def render(self):
+        lines = [
+            "# HELP dashboard_stage_seconds Time spent in each dashboard stage per rerun",
+            "# TYPE dashboard_stage_seconds histogram",
+        ]
+        with self._lock:
+            for stage, entry in sorted(self._stages.items()):
+                for bound, count in zip(self.buckets, entry["buckets"]):
+                    lines.append(f'dashboard_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {count}')
+                lines.append(f'dashboard_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {entry["count"]}')
+                lines.append(f'dashboard_stage_seconds_sum{{stage="{stage}"}} {entry["sum"]:.6f}')
+                lines.append(f'dashboard_stage_seconds_count{{stage="{stage}"}} {entry["count"]}')
+        return "\n".join(lines) + "\n"
+
+
+def render_cache_metrics(stats):
+    """Figure cache counters and gauges in Prometheus text format."""
+    lines = []
+    for name, kind, help_text, value in (
+        ("hits_total", "counter", "Figure cache lookups served from the cache", stats["hits"]),
+        ("misses_total", "counter", "Figure cache lookups that built the figure", stats["misses"]),
+        ("evictions_total", "counter", "Figures evicted to stay within the cache bounds", stats["evictions"]),
+        ("entries", "gauge", "Figures currently cached", stats["entries"]),
+        ("bytes", "gauge", "Estimated bytes held by cached figures", stats["bytes"]),
+    ):
+        lines += [
+            f"# HELP dashboard_figure_cache_{name} {help_text}",
+            f"# TYPE dashboard_figure_cache_{name} {kind}",
+            f"dashboard_figure_cache_{name} {value}",
+        ]
+    return "\n".join(lines) + "\n"
+
+
+class WireCounter:
+    """Bytes and messages written to each session's websocket, per rerun.
+
+    A rerun's messages are still being flushed when its script ends, so totals
+    are closed when its script_finished message goes out, on the server thread.
+    """
+
+    def __init__(self):
+        self._current = {}
+        self._last = {}
+        self._lock = threading.Lock()
+
+    def add(self, session_id, size, by_reference, finished):
+        with self._lock:
+            totals = self._current.setdefault(session_id, [0, 0, 0])
+            totals[0] += size
+            totals[1] += 1
+            totals[2] += by_reference
+            if not finished:
+                return None
+            del self._current[session_id]
+            self._last[session_id] = totals
+        return totals
+
+    def last(self, session_id):
+        """(bytes, messages, messages sent by content-hash reference) of the session's last finished rerun."""
+        with self._lock:
+            return tuple(self._last.get(session_id, (0, 0, 0)))
+
+
+class Recorder:
+    """Spans recorded during one rerun (full app or a single fragment) of one session."""
+
+    def __init__(self):
+        self.spans = []
+        self.depth = 0
+        self.full_run = False
+        self.started = None
+
+    def reset(self, full_run):
+        self.spans = []
+        self.depth = 0
+        self.full_run = full_run
+        self.started = time.perf_counter()
+
+
+@st.cache_resource(show_spinner=False)
+def get_histograms():
+    return Histograms()
+
+
+@st.cache_resource(show_spinner=False)
+def get_wire_counter():
+    """Counts what every session's websocket is sent, by wrapping Streamlit's handler once per process."""
+    counter = WireCounter()
+    try:
+        from streamlit.web.server.browser_websocket_handler import BrowserWebSocketHandler
+    except ImportError:
+        return counter
+    write = BrowserWebSocketHandler.write_forward_msg
+
+    def counted_write(handler, msg):
+        kind = msg.WhichOneof("type")
+        totals = counter.add(handler._session_id, msg.ByteSize(), kind == "ref_hash", kind == "script_finished")
+        if totals is not None:
+            _log({
+                "ts": time.time(),
+                "session_id": handler._session_id,
+                "kind": "wire",
+                "bytes_sent": totals[0],
+                "messages_sent": totals[1],
+                "messages_by_reference": totals[2],
+            })
+        return write(handler, msg)
+
+    BrowserWebSocketHandler.write_forward_msg = counted_write
+    return counter
+
+
+@st.cache_resource(show_spinner=False)
+def _log_lock():
+    return threading.Lock()
+
+
+def _recorder():
+    if not enabled() or get_script_run_ctx(suppress_warning=True) is None:
+        return None
+    recorder = st.session_state.get(_SESSION_KEY)
+    if recorder is None:
+        recorder = st.session_state[_SESSION_KEY] = Recorder()
+    return recorder
+
+
+@contextlib.contextmanager
+def _timed(recorder, name):
+    # A top-level span outside a full app run is a fragment rerun: it is its own record
+    standalone = recorder.depth == 0 and not recorder.full_run
+    if standalone:
+        recorder.reset(full_run=False)
+    recorder.depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.depth -= 1
+        recorder.spans.append((name, recorder.depth, start, time.perf_counter() - start))
+        if standalone:
+            _flush(recorder, "fragment")
+
+
+def span(name):
+    """Time the enclosed block as stage ``name`` when instrumentation is enabled."""
+    recorder = _recorder()
+    if recorder is None:
+        return _NOOP
+    return _timed(recorder, name)
+
+
+def timed(name):
+    """Decorator form of span(); goes under @st.fragment so fragment reruns are timed too."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def start_rerun():
+    """Mark the start of a full app rerun; spans until finish_rerun() belong to it."""
+    recorder = _recorder()
+    if recorder is not None:
+        recorder.reset(full_run=True)
+        get_wire_counter()
+
+
+def finish_rerun():
+    """Close the current full rerun: log it and render the sidebar Performance panel."""
+    recorder = _recorder()
+    if recorder is None or not recorder.full_run:
+        return
+    record = _flush(recorder, "full")
+    recorder.full_run = False
+    render_panel(record)
+
+
+def _flush(recorder, kind):
+    total = time.perf_counter() - recorder.started
+    histograms = get_histograms()
+    histograms.observe("rerun", total)
+    for name, _, _, seconds in recorder.spans:
+        histograms.observe(name, seconds)
+
+    ctx = get_script_run_ctx(suppress_warning=True)
+    record = {
+        "ts": time.time(),
+        "session_id": ctx.session_id if ctx is not None else None,
+        "kind": kind,
+        "total_ms": round(total * 1000, 3),
+        "spans": [
+            {"name": name, "depth": depth, "ms": round(seconds * 1000, 3)}
+            # Spans close innermost-first; list them in the order they were opened
+            for name, depth, _, seconds in sorted(recorder.spans, key=lambda item: item[2])
+        ],
+        "widgets": {key: st.session_state[key] for key in LOGGED_WIDGET_KEYS if key in st.session_state},
+    }
+    _log(record)
+    return record
+
+
+def _log(record):
+    with _log_lock():
+        with open(os.environ.get(LOG_PATH_ENV, DEFAULT_LOG_PATH), "a", encoding="utf-8") as handle:
+            handle.write(json.dumps(record, default=str, ensure_ascii=False) + "\n")
+
+
+def render_panel(record):
+    with st.sidebar.expander("⏱️ Performance", expanded=False):
+        st.caption(f"Rerun total: {record['total_ms']:.1f} ms")
+        sent, messages, by_reference = get_wire_counter().last(record["session_id"])
+        st.caption(f"Previous rerun sent {sent / 1024:.1f} KB in {messages} messages ({by_reference} by reference)")
+        cache = get_figure_cache().stats()
+        st.caption(
+            f"Figure cache: {cache['entries']} figures, {cache['bytes'] / 1024:.0f} KB,"
+            f" {cache['hit_rate']:.0%} hit rate ({cache['hits']} hits, {cache['misses']} misses)"
+        )
+        st.dataframe(
+            [
+                {"Stage": "· " * item["depth"] + item["name"], "ms": item["ms"]}
+                for item in record["spans"]
+            ],
+            use_container_width=True,
+            hide_index=True,
+        )
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    histograms = None
+    figure_cache = None
+
+    def do_GET(self):
+        if self.path.rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        body = (self.histograms.render() + render_cache_metrics(self.figure_cache.stats())).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@st.cache_resource(show_spinner=False)
+def start_metrics_server(port):
+    """Serve /metrics on localhost:``port`` from a daemon thread, once per process."""
+    handler = type("MetricsHandler", (_MetricsHandler,), {"histograms": get_histograms(), "figure_cache": get_figure_cache()})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, name="dashboard-metrics", daemon=True).start()
+    return server
+
+
+def maybe_start_metrics_server():
+    port = os.environ.get(METRICS_PORT_ENV)
+    if enabled() and port:
+        start_metrics_server(int(port))
@@ -0,0 +1,261 @@
+"""Pre-render common dashboard views into a static bundle.
+
+Renders the Solutions Matrix figure for every combination of chart type, color
+theme, solution category and industry subset, the first page of the matrix
+table per category and subset, and the default Deep Dive figure, using a process
+pool. The app serves these artifacts whenever a view and the data version
+match, and computes everything else live.
+
+    python prerender.py --output prerendered --workers 4
+    python prerender.py --industry-subset "Ecommerce,Gcloud" --industry-subset Blockchain
+
+Point the app at the bundle with PORTFOLIO_PRERENDERED_DIR (default "prerendered").
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import streamlit as st
+
+from figure_cache import figure_key
+
+PRERENDERED_DIR_ENV = "PORTFOLIO_PRERENDERED_DIR"
+DEFAULT_PRERENDERED_DIR = "prerendered"
+MANIFEST = "manifest.json"
+
+
+def solutions_matrix_key(version, chart_type, color_theme, solution_category, selected_industries):
+    return figure_key(
+        chart="solutions_matrix",
+        version=version,
+        chart_type=chart_type,
+        color_theme=color_theme,
+        solution_category=solution_category,
+        selected_industries=selected_industries,
+    )
+
+
+def solution_availability_key(version, selected_solution, selected_industries):
+    return figure_key(
+        chart="solution_availability",
+        version=version,
+        selected_solution=selected_solution,
+        selected_industries=selected_industries,
+    )
+
+
+def table_key(version, solution_category, selected_industries, page_size):
+    # Only the first page in catalogue order with no search is pre-rendered
+    return figure_key(
+        table="solutions_matrix",
+        version=version,
+        solution_category=solution_category,
+        selected_industries=selected_industries,
+        page_size=page_size,
+    )
+
+
+class Bundle:
+    """A pre-rendered bundle on disk. Artifacts are read on every call; callers keep
+    them in the shared figure cache, which bounds their memory."""
+
+    def __init__(self, directory, manifest):
+        self.directory = directory
+        self.version = manifest["data_version"]
+        self.figures = manifest["figures"]
+        self.tables = manifest["tables"]
+
+    def _read(self, path):
+        with open(os.path.join(self.directory, path), encoding="utf-8") as handle:
+            return handle.read()
+
+    def figure(self, key):
+        path = self.figures.get(key)
+        if path is None:
+            return None
+        import plotly.io as pio
+        return pio.from_json(self._read(path), skip_invalid=True)
+
+    def table(self, key):
+        path = self.tables.get(key)
+        if path is None:
+            return None
+        return _table_from_json(self._read(path))
+
+
+def _table_to_json(frame):
+    return json.dumps({
+        "index_name": frame.index.name,
+        "index": frame.index.tolist(),
+        "columns": frame.columns.tolist(),
+        "data": frame.to_numpy().tolist(),
+    }, ensure_ascii=False)
+
+
+def _table_from_json(text):
+    payload = json.loads(text)
+    return pd.DataFrame(
+        payload["data"],
+        index=pd.Index(payload["index"], name=payload["index_name"]),
+        columns=payload["columns"],
+        dtype=bool,
+    )
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _load_bundle(directory, mtime_ns):
+    with open(os.path.join(directory, MANIFEST), encoding="utf-8") as handle:
+        return Bundle(directory, json.load(handle))
+
+
+def get_bundle(version):
+    """The pre-rendered bundle if one exists for data ``version``, else None."""
+    directory = os.environ.get(PRERENDERED_DIR_ENV, DEFAULT_PRERENDERED_DIR)
+    try:
+        mtime_ns = os.stat(os.path.join(directory, MANIFEST)).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    bundle = _load_bundle(directory, mtime_ns)
+    return bundle if bundle.version == version else None
+
+
+# Per-process state of the pool workers, filled in by _init_worker()
+_worker = {}
+
+
+def _init_worker(output):
+    from aggregates import get_aggregates
+    from bitset_index import get_index
+    from matrix import get_matrix
+
+    matrix = get_matrix()
+    _worker.update(output=output, matrix=matrix, index=get_index(matrix), aggregates=get_aggregates(matrix))
+
+
+def _write(kind, key, text):
+    path = os.path.join(kind, f"{key}.json")
+    with open(os.path.join(_worker["output"], path), "w", encoding="utf-8") as handle:
+        handle.write(text)
+    return kind, key, path, len(text)
+
+
+def _render(task):
+    import plotly.io as pio
+
+    from app import filter_solutions
+    from charts import distribution_figure, solution_availability_figure
+    from matrix_table import table_rows, table_window
+
+    matrix, index = _worker["matrix"], _worker["index"]
+    kind, params = task
+    category, industries = params["solution_category"], params["selected_industries"]
+    solution_rows = filter_solutions(index, category)
+
+    if kind == "table":
+        rows = table_rows(matrix, index, solution_rows, industries)
+        window = table_window(matrix, rows, industries, 0, params["page_size"])
+        return _write("tables", table_key(matrix.version, category, industries, params["page_size"]), _table_to_json(window))
+
+    if kind == "solution_availability":
+        # The app shows no Deep Dive chart when the category has no solutions
+        if solution_rows is not None and len(solution_rows) == 0:
+            return None
+        solution = matrix.solutions[0] if solution_rows is None else matrix.solutions[solution_rows[0]]
+        fig = solution_availability_figure(solution, industries, matrix.row(solution, industries))
+        return _write("figures", solution_availability_key(matrix.version, solution, industries), pio.to_json(fig, validate=False))
+
+    fig = distribution_figure(
+        matrix, index, _worker["aggregates"], solution_rows, industries, params["chart_type"], params["color_theme"]
+    )
+    if fig is None:
+        return None
+    key = solutions_matrix_key(matrix.version, params["chart_type"], params["color_theme"], category, industries)
+    return _write("figures", key, pio.to_json(fig, validate=False))
+
+
+def enumerate_tasks(industries, subsets, chart_types, color_themes, categories, page_sizes):
+    tasks = []
+    for subset in [industries] + subsets:
+        for category in categories:
+            base = {"solution_category": category, "selected_industries": subset}
+            for chart_type in chart_types:
+                for color_theme in color_themes:
+                    tasks.append(("solutions_matrix", dict(base, chart_type=chart_type, color_theme=color_theme)))
+            tasks.append(("solution_availability", base))
+            for page_size in page_sizes:
+                tasks.append(("table", dict(base, page_size=page_size)))
+    return tasks
+
+
+def _split(value):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def main(argv=None):
+    from app import CHART_TYPES, COLOR_THEMES, SOLUTION_CATEGORIES
+    from matrix import get_matrix
+    from matrix_table import TABLE_PAGE_SIZES
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default=os.environ.get(PRERENDERED_DIR_ENV, DEFAULT_PRERENDERED_DIR))
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chart-types", default=",".join(CHART_TYPES))
+    parser.add_argument("--color-themes", default=",".join(COLOR_THEMES))
+    parser.add_argument("--categories", default=",".join(SOLUTION_CATEGORIES))
+    parser.add_argument("--page-sizes", default=str(TABLE_PAGE_SIZES[0]),
+                        help="comma-separated table page sizes to snapshot")
+    parser.add_argument("--industry-subset", action="append", default=[],
+                        help="comma-separated industries rendered in addition to all industries; repeatable")
+    args = parser.parse_args(argv)
+
+    matrix = get_matrix()
+    unknown = [name for subset in args.industry_subset for name in _split(subset) if name not in matrix.industry_index]
+    if unknown:
+        parser.error(f"unknown industries: {', '.join(unknown)}")
+    tasks = enumerate_tasks(
+        matrix.industries,
+        [_split(subset) for subset in args.industry_subset],
+        _split(args.chart_types),
+        _split(args.color_themes),
+        _split(args.categories),
+        [int(size) for size in _split(args.page_sizes)],
+    )
+
+    for kind in ("figures", "tables"):
+        os.makedirs(os.path.join(args.output, kind), exist_ok=True)
+    started = time.perf_counter()
+    manifest = {"data_version": matrix.version, "created": time.time(), "figures": {}, "tables": {}}
+    total_bytes = 0
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(args.output,)) as pool:
+        for result in pool.map(_render, tasks, chunksize=max(1, len(tasks) // (4 * (args.workers or 1)))):
+            if result is None:
+                continue
+            kind, key, path, size = result
+            manifest[kind][key] = path
+            total_bytes += size
+
+    # The manifest is swapped in last, so the app never sees a half-written bundle
+    tmp_path = os.path.join(args.output, f"{MANIFEST}.tmp-{os.getpid()}")
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, ensure_ascii=False)
+    os.replace(tmp_path, os.path.join(args.output, MANIFEST))
+
+    # Drop artifacts of earlier bundles that the new manifest no longer lists
+    listed = set(manifest["figures"].values()) | set(manifest["tables"].values())
+    for kind in ("figures", "tables"):
+        for name in os.listdir(os.path.join(args.output, kind)):
+            if os.path.join(kind, name) not in listed:
+                os.remove(os.path.join(args.output, kind, name))
+
+    print(
+        f"Pre-rendered {len(manifest['figures'])} figures and {len(manifest['tables'])} tables"
+        f" ({total_bytes / 1e6:.1f} MB) for data version {matrix.version}"
+        f" in {time.perf_counter() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
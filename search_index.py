@@ -0,0 +1,136 @@
+import math
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import data_source
+from crosswalk import CsrMatrix
+from matrix import PortfolioMatrix, get_matrix
+
+# Share of a query's trigrams a name or description must contain to match
+MIN_GRAM_MATCH = 0.6
+# A description match ranks below a name match of the same strength
+DESCRIPTION_WEIGHT = 0.8
+# Candidates re-ranked with the exact prefix and substring checks, per result asked for
+RERANK_FACTOR = 8
+
+_NON_WORD = re.compile(r"\W+")
+
+
+def normalize(text):
+    """Unicode-normalized, case-folded text with runs of non-word characters as single spaces."""
+    return _NON_WORD.sub(" ", unicodedata.normalize("NFKC", str(text)).casefold()).strip()
+
+
+def trigrams(text):
+    """Trigrams of every word of normalized ``text``, padded at the start only.
+
+    "chat" gives "$$c", "$ch", "cha", "hat", so any prefix of a word shares all
+    of its own trigrams with the word and typeahead queries match as typed.
+    """
+    grams = set()
+    for word in text.split():
+        padded = "$$" + word
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class SearchIndex:
+    """Trigram index over names and optional descriptions, ranked for typeahead.
+
+    Postings are CSR rows (one per trigram) of document positions, so a query
+    is a handful of row lookups and one bincount per field.
+    """
+
+    def __init__(self, names, descriptions=None):
+        self.names = list(names)
+        self.positions = {name: i for i, name in enumerate(self.names)}
+        self._normalized = [normalize(name) for name in self.names]
+        descriptions = descriptions or {}
+        self._vocabulary = {}
+        name_pairs = self._gram_pairs(self._normalized)
+        description_pairs = self._gram_pairs([normalize(descriptions.get(name, "")) for name in self.names])
+        # Grams are numbered as they are first seen, so the shape is known only now
+        shape = (len(self._vocabulary), len(self.names))
+        self._name_postings = CsrMatrix.from_coordinates(*name_pairs, shape)
+        self._description_postings = CsrMatrix.from_coordinates(*description_pairs, shape)
+
+    def _gram_pairs(self, texts):
+        grams, documents = [], []
+        for position, text in enumerate(texts):
+            for gram in trigrams(text):
+                grams.append(self._vocabulary.setdefault(gram, len(self._vocabulary)))
+                documents.append(position)
+        return np.array(grams, dtype=np.int64), np.array(documents, dtype=np.int64), np.ones(len(grams), dtype=np.int64)
+
+    def _hits(self, postings, gram_ids):
+        """Number of the query's trigrams each document contains."""
+        if not gram_ids:
+            return np.zeros(len(self.names), dtype=np.int64)
+        return np.bincount(np.concatenate([postings.row(g)[0] for g in gram_ids]), minlength=len(self.names))
+
+    def search(self, query, limit=20, allowed=None):
+        """Positions of the best ``limit`` matches for ``query``, best first.
+
+        ``allowed`` is an optional boolean mask over the documents. An empty
+        query returns the first allowed documents in their original order.
+        """
+        query = normalize(query)
+        if allowed is None:
+            allowed = np.ones(len(self.names), dtype=bool)
+        if not query:
+            return np.flatnonzero(allowed)[:limit]
+
+        grams = trigrams(query)
+        gram_ids = [self._vocabulary[gram] for gram in grams if gram in self._vocabulary]
+        name_hits = self._hits(self._name_postings, gram_ids)
+        description_hits = self._hits(self._description_postings, gram_ids)
+        needed = math.ceil(len(grams) * MIN_GRAM_MATCH)
+        candidates = np.flatnonzero(allowed & (np.maximum(name_hits, description_hits) >= needed))
+        if len(candidates) == 0:
+            return candidates
+
+        scores = np.maximum(name_hits[candidates], DESCRIPTION_WEIGHT * description_hits[candidates]) / len(grams)
+        if len(candidates) > limit * RERANK_FACTOR:
+            keep = np.argpartition(-scores, limit * RERANK_FACTOR - 1)[:limit * RERANK_FACTOR]
+            candidates, scores = candidates[keep], scores[keep]
+
+        # Names starting with the query, then names containing it, rank first
+        ranked = sorted(
+            zip(candidates.tolist(), scores.tolist()),
+            key=lambda item: (
+                -(item[1] + self._normalized[item[0]].startswith(query) + (query in self._normalized[item[0]]) * 0.5),
+                item[0],
+            ),
+        )
+        return np.array([position for position, _ in ranked[:limit]], dtype=np.int64)
+
+    def mask(self, names):
+        """Boolean mask over the documents selecting ``names``."""
+        mask = np.zeros(len(self.names), dtype=bool)
+        mask[[self.positions[name] for name in names if name in self.positions]] = True
+        return mask
+
+
+@st.cache_resource(show_spinner=False, max_entries=4, hash_funcs={PortfolioMatrix: lambda m: m.cache_key})
+def _build_solution_index(matrix):
+    # Names never change with cell edits, so one index serves every revision
+    return SearchIndex(pd.unique(matrix.solutions), data_source.SOLUTION_DESCRIPTIONS)
+
+
+@st.cache_resource(show_spinner=False, max_entries=4, hash_funcs={PortfolioMatrix: lambda m: m.cache_key})
+def _build_industry_index(matrix):
+    return SearchIndex(matrix.industries)
+
+
+def get_solution_search(matrix=None):
+    """Search index over the solution names and descriptions of the current data version."""
+    return _build_solution_index(matrix if matrix is not None else get_matrix())
+
+
+def get_industry_search(matrix=None):
+    """Search index over the industry names of the current data version."""
+    return _build_industry_index(matrix if matrix is not None else get_matrix())
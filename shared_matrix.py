@@ -0,0 +1,85 @@
+import hashlib
+import json
+import os
+import struct
+
+import numpy as np
+
+# Directory where the canonical matrix is published for every server process on
+# the host, e.g. /dev/shm/portfolio. When unset, each process builds its own copy.
+SHARED_DIR_ENV = "PORTFOLIO_SHARED_DIR"
+
+# Segment layout: a fixed header, the data version (UTF-8), the labels (JSON),
+# then the row-major boolean matrix starting on a 64-byte boundary.
+MAGIC = b"PFMX"
+LAYOUT_VERSION = 1
+_HEADER = struct.Struct("<4sIQQQIQ")  # magic, layout, rows, columns, labels length, version length, values offset
+_ALIGN = 64
+
+
+def shared_dir():
+    return os.environ.get(SHARED_DIR_ENV) or None
+
+
+def segment_path(directory, version):
+    digest = hashlib.sha1(version.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(directory, f"matrix-{digest}.bin")
+
+
+def publish(path, solutions, industries, values, version):
+    """Write a segment for ``version`` and move it into place in one atomic rename.
+
+    Processes attach either the previous complete segment or this one, never a
+    partial file. Older segments in the directory are unlinked; processes that
+    still map them keep their pages until they let go.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    version_bytes = version.encode("utf-8")
+    labels = json.dumps(
+        {"solutions": [str(name) for name in solutions], "industries": [str(name) for name in industries]},
+        ensure_ascii=False
+    ).encode("utf-8")
+    values = np.ascontiguousarray(values, dtype=bool)
+    offset = _HEADER.size + len(version_bytes) + len(labels)
+    offset += -offset % _ALIGN
+    header = _HEADER.pack(MAGIC, LAYOUT_VERSION, values.shape[0], values.shape[1], len(labels), len(version_bytes), offset)
+
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "wb") as handle:
+        handle.write(header + version_bytes + labels)
+        handle.write(b"\0" * (offset - handle.tell()))
+        handle.write(values.tobytes())
+    os.replace(tmp_path, path)
+
+    for name in os.listdir(directory):
+        other = os.path.join(directory, name)
+        if name.startswith("matrix-") and name.endswith(".bin") and other != path:
+            try:
+                os.remove(other)
+            except OSError:
+                pass
+
+
+def attach(path, version):
+    """Map the segment at ``path`` if it holds ``version``.
+
+    Returns (solutions, industries, values, version) or None when there is no
+    matching segment. ``values`` is a copy-on-write memory map: every process
+    shares the page cache, and an edit only copies the page it touches.
+    """
+    try:
+        with open(path, "rb") as handle:
+            magic, layout, rows, columns, labels_length, version_length, offset = _HEADER.unpack(handle.read(_HEADER.size))
+            if magic != MAGIC or layout != LAYOUT_VERSION:
+                return None
+            if handle.read(version_length).decode("utf-8") != version:
+                return None
+            labels = json.loads(handle.read(labels_length).decode("utf-8"))
+    except (FileNotFoundError, struct.error):
+        return None
+    if rows * columns == 0:
+        values = np.zeros((rows, columns), dtype=bool)
+    else:
+        values = np.memmap(path, dtype=bool, mode="c", offset=offset, shape=(rows, columns))
+    return labels["solutions"], labels["industries"], values, version
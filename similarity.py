@@ -0,0 +1,230 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import streamlit as st
+
+from bitset_index import bit_counts, get_index, pack_bits, popcount
+from matrix import PortfolioMatrix, get_matrix
+
+METRICS = ("jaccard", "cosine")
+
+# Top-k neighbours of every solution can be precomputed when the engine is built
+# (0 disables it), in chunks whose working set stays within the memory budget
+PRECOMPUTE_K_ENV = "PORTFOLIO_SIMILARITY_PRECOMPUTE_K"
+MEMORY_BUDGET_ENV = "PORTFOLIO_SIMILARITY_MEMORY_MB"
+DEFAULT_MEMORY_BUDGET_MB = 64
+
+# Per-solution results kept by each engine
+MAX_CACHED_QUERIES = 1024
+
+# Working bytes per (solution, solution) pair of a precompute chunk: int64
+# intersections (8), the AND and popcount buffers (9), and the float64
+# temporaries of similarity() (24) and _top_k() (32), rounded up
+_PRECOMPUTE_PAIR_BYTES = 80
+# Bytes per stored neighbour: int32 position, float64 score, int32 shared count
+_TABLE_ENTRY_BYTES = 16
+
+logger = logging.getLogger(__name__)
+
+
+def similarity(metric, intersections, coverage_a, coverage_b):
+    """Jaccard or cosine similarity from intersection sizes and the two sets' sizes.
+
+    Arguments broadcast against each other; pairs of empty footprints score 0.
+    """
+    intersections = np.asarray(intersections, dtype=np.float64)
+    if metric == "jaccard":
+        denominator = coverage_a + coverage_b - intersections
+    elif metric == "cosine":
+        denominator = np.sqrt(np.multiply(coverage_a, coverage_b, dtype=np.float64))
+    else:
+        raise ValueError(f"unknown similarity metric: {metric}")
+    denominator = np.broadcast_to(denominator, intersections.shape)
+    return np.divide(intersections, denominator, out=np.zeros(intersections.shape), where=denominator > 0)
+
+
+def _top_k(scores, k):
+    """Column positions of the k best scores in each row, best first, ties in catalogue order.
+
+    argpartition alone picks arbitrarily among ties at the k-th score, so those
+    are resolved explicitly to keep precomputed and on-demand results identical.
+    """
+    k = min(k, scores.shape[1])
+    kth = -np.partition(-scores, k - 1, axis=1)[:, k - 1:k]
+    above = scores > kth
+    at = scores == kth
+    # Ties at the k-th score are taken by position, as many as are still missing
+    at &= np.cumsum(at, axis=1) <= k - above.sum(axis=1, keepdims=True)
+    positions = np.nonzero(above | at)[1].reshape(len(scores), k)
+    selected = np.take_along_axis(scores, positions, axis=1)
+    order = np.lexsort((positions, -selected), axis=1)
+    return np.take_along_axis(positions, order, axis=1)
+
+
+class Neighbours:
+    """Top-k similar solutions of one solution, best first."""
+
+    def __init__(self, positions, scores, shared):
+        self.positions = positions
+        self.scores = scores
+        # Number of industries each neighbour has in common with the solution
+        self.shared = shared
+
+    def head(self, k):
+        return Neighbours(self.positions[:k], self.scores[:k], self.shared[:k])
+
+
+class SimilarityEngine:
+    """Top-k solutions with the most similar industry footprint.
+
+    A single solution is scored against the whole catalogue with one AND and a
+    popcount per packed row of the bitset index, which stays current under
+    edits. Results are cached per matrix revision, so an edit never serves a
+    stale neighbour list.
+    """
+
+    def __init__(self, matrix, index):
+        self.matrix = matrix
+        self.index = index
+        self._cache = OrderedDict()
+        self._precomputed = {}
+        self._lock = threading.Lock()
+
+    def neighbours(self, position, k=10, metric="jaccard", industries=None):
+        """Most similar solutions to the solution at row ``position``, excluding itself.
+
+        With ``industries`` the footprints are compared over those industries
+        only. Neighbours with nothing in common are left out.
+        """
+        if industries is not None and len(industries) == self.index.n_industries:
+            industries = None
+        revision = self.matrix.revision
+        key = (revision, position, k, metric, None if industries is None else tuple(industries))
+        with self._lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self._cache.move_to_end(key)
+                return result
+            table = self._precomputed.get(metric)
+
+        if industries is None and table is not None and table.revision == revision and table.k >= k:
+            result = table.neighbours(position, k)
+        else:
+            rows, coverage = self._footprints(industries)
+            shared = popcount(rows & rows[position])
+            scores = similarity(metric, shared, coverage[position], coverage)
+            scores[position] = -1.0
+            positions = _top_k(scores[np.newaxis, :], k)[0]
+            result = self._result(positions, scores, shared)
+
+        with self._lock:
+            self._cache[key] = result
+            while len(self._cache) > MAX_CACHED_QUERIES:
+                self._cache.popitem(last=False)
+        return result
+
+    def _footprints(self, industries):
+        if industries is None:
+            return self.index.by_solution, self.index.coverage
+        mask = np.zeros(self.index.n_industries, dtype=bool)
+        mask[[self.index.industry_index[name] for name in industries]] = True
+        rows = self.index.by_solution & pack_bits(mask)
+        return rows, popcount(rows)
+
+    @staticmethod
+    def _result(positions, scores, shared):
+        keep = scores[positions] > 0
+        positions = positions[keep]
+        return Neighbours(positions, scores[positions], shared[positions])
+
+    def precompute(self, k, metric="jaccard", memory_budget=DEFAULT_MEMORY_BUDGET_MB * 1024 * 1024):
+        """Top-k neighbours of every solution, over all industries, in row chunks.
+
+        Intersections of a chunk against the catalogue are ANDs and popcounts
+        of the packed rows of the bitset index, one 64-industry word at a time.
+        The chunk size keeps the result table, a word-major copy of the packed
+        rows and the chunk's working arrays within ``memory_budget`` bytes;
+        raises ValueError if not even one row fits. Returns the table.
+        """
+        revision = self.matrix.revision
+        coverage = self.index.coverage
+        n = self.index.n_solutions
+        k = min(k, max(n - 1, 1))
+        # Word-major, so each step of the word loop reads contiguous memory
+        words = np.ascontiguousarray(self.index.by_solution.T)
+        fixed = n * k * _TABLE_ENTRY_BYTES + words.nbytes
+        chunk = min(n, (memory_budget - fixed) // (n * _PRECOMPUTE_PAIR_BYTES))
+        if chunk < 1:
+            needed = fixed + n * _PRECOMPUTE_PAIR_BYTES
+            raise ValueError(
+                f"precomputing {k} {metric} neighbours of {n} solutions needs at least "
+                f"{needed / 2**20:.1f} MB, over the {memory_budget / 2**20:.1f} MB budget"
+            )
+
+        positions = np.empty((n, k), dtype=np.int32)
+        scores = np.empty((n, k), dtype=np.float64)
+        shared = np.empty((n, k), dtype=np.int32)
+        for start in range(0, n, chunk):
+            stop = min(start + chunk, n)
+            intersections = np.zeros((stop - start, n), dtype=np.int64)
+            anded = np.empty((stop - start, n), dtype=np.uint64)
+            for word in words:
+                np.bitwise_and(word[start:stop, np.newaxis], word, out=anded)
+                intersections += bit_counts(anded)
+            chunk_scores = similarity(metric, intersections, coverage[start:stop, np.newaxis], coverage)
+            chunk_scores[np.arange(stop - start), np.arange(start, stop)] = -1.0
+            top = _top_k(chunk_scores, k)
+            positions[start:stop] = top
+            scores[start:stop] = np.take_along_axis(chunk_scores, top, axis=1)
+            shared[start:stop] = np.take_along_axis(intersections, top, axis=1)
+
+        table = PrecomputedNeighbours(revision, positions, scores, shared)
+        with self._lock:
+            self._precomputed[metric] = table
+        return table
+
+
+class PrecomputedNeighbours:
+    """Top-k neighbours of every solution at one matrix revision, with their scores."""
+
+    def __init__(self, revision, positions, scores, shared):
+        self.revision = revision
+        self.positions = positions
+        self.scores = scores
+        self.shared = shared
+
+    @property
+    def k(self):
+        return self.positions.shape[1]
+
+    def neighbours(self, position, k):
+        scores = self.scores[position, :k]
+        keep = scores > 0
+        return Neighbours(
+            self.positions[position, :k][keep].astype(np.int64), scores[keep], self.shared[position, :k][keep].astype(np.int64)
+        )
+
+
+@st.cache_resource(show_spinner=False, max_entries=4, hash_funcs={PortfolioMatrix: lambda m: m.cache_key})
+def _build_engine(matrix):
+    engine = SimilarityEngine(matrix, get_index(matrix))
+    k = int(os.environ.get(PRECOMPUTE_K_ENV, 0))
+    if k > 0:
+        budget = int(float(os.environ.get(MEMORY_BUDGET_ENV, DEFAULT_MEMORY_BUDGET_MB)) * 1024 * 1024)
+        with matrix.edit_lock:
+            for metric in METRICS:
+                try:
+                    engine.precompute(k, metric, budget)
+                except ValueError as error:
+                    # Neighbours are then computed on demand, one solution at a time
+                    logger.warning("Skipping similarity precompute: %s", error)
+                    break
+    return engine
+
+
+def get_similarity_engine(matrix=None):
+    """The similarity engine for the current data version."""
+    return _build_engine(matrix if matrix is not None else get_matrix())